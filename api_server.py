@@ -0,0 +1,251 @@
+"""
+Headless JSON API around generate_or_retrieve_qa.
+
+Serves programmatic clients (e.g. ATS integrations) without the Streamlit
+page. One warm vector store and history database are shared by all requests;
+cache hits are answered on the request thread, while LLM work runs on a
+bounded worker pool and misses beyond the queue limit are rejected with 503
+instead of piling up.
+
+Usage:
+    python api_server.py --port 8000 --workers 4
+    python api_server.py --fake-llm --fake-llm-latency 2.0   # local load testing
+
+Endpoints:
+    GET  /health
+    POST /generate      {"job_description": "...", "interview_level": "entry"}
+    GET  /lookup?job_description=...&interview_level=entry
+    GET  /history?limit=10&before_id=123
+    GET  /history/<id>
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from utils.history_store import HistoryStore
+from utils.qa_generator import (
+    INTERVIEW_LEVELS,
+    generate_or_retrieve_qa,
+    get_vector_store,
+    lookup_qa,
+    make_title,
+    retrieve_qa,
+)
+from utils.warmup import start_warmup
+
+MAX_HISTORY_PAGE = 100
+
+
+class FakeLLM:
+    """Stand-in for Gemini that returns canned markdown after a fixed delay"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def __call__(self, job_description, interview_level):
+        if self.latency:
+            time.sleep(self.latency)
+        return (
+            "## Technical Questions\n\n"
+            f"**Q1: What experience do you have relevant to this {interview_level} role?**\n"
+            f"A: Placeholder answer for: {job_description[:80]}\n"
+        )
+
+
+class QAService:
+    """Shared state behind the HTTP handler"""
+
+    def __init__(self, workers=4, max_queue=32, generate=None, history_store=None):
+        self.generate = generate
+        self.history_store = history_store or HistoryStore()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qa-llm")
+        # Running plus queued generations; beyond this the service is overloaded
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def warm_up(self):
+        """Import lazily loaded dependencies and load the vector store before serving"""
+        start_warmup().wait()
+        get_vector_store()
+
+    def generate_qa(self, job_description, interview_level):
+        """Serve cache hits directly and run misses on the worker pool
+
+        Returns None when a miss finds the queue full; hits never wait for
+        an LLM slot.
+        """
+        result = retrieve_qa(job_description, interview_level, self.generate)
+        if result is None:
+            if not self._slots.acquire(blocking=False):
+                return None
+            try:
+                future = self._executor.submit(
+                    generate_or_retrieve_qa, job_description, interview_level, self.generate
+                )
+                result = future.result()
+            finally:
+                self._slots.release()
+        qa_content, from_cache, title = result
+
+        history_id = self.history_store.add_entry(job_description, interview_level, title, qa_content)
+        return {
+            "qa_content": qa_content,
+            "from_cache": from_cache,
+            "title": title,
+            "history_id": history_id,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class QARequestHandler(BaseHTTPRequestHandler):
+    service = None  # set by create_server
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _validate(self, job_description, interview_level):
+        if not isinstance(job_description, str) or not job_description.strip():
+            return "job_description is required"
+        if interview_level not in INTERVIEW_LEVELS:
+            return f"interview_level must be one of: {', '.join(INTERVIEW_LEVELS)}"
+        return None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif url.path == "/lookup":
+                self._handle_lookup(params)
+            elif url.path == "/history":
+                self._handle_history(params)
+            elif url.path.startswith("/history/"):
+                self._handle_history_entry(url.path[len("/history/"):])
+            else:
+                self._send_json(404, {"error": "Not found"})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/generate":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            body = self._read_json()
+        except ValueError:
+            self._send_json(400, {"error": "Request body must be JSON"})
+            return
+        if not isinstance(body, dict):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return
+
+        job_description = body.get("job_description", "")
+        interview_level = body.get("interview_level", "entry")
+        error = self._validate(job_description, interview_level)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+
+        try:
+            result = self.service.generate_qa(job_description, interview_level)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        if result is None:
+            self._send_json(503, {"error": "Too many pending generations, retry later"})
+            return
+        self._send_json(200, result)
+
+    def _handle_lookup(self, params):
+        job_description = params.get("job_description", "")
+        interview_level = params.get("interview_level", "entry")
+        error = self._validate(job_description, interview_level)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+        match = lookup_qa(job_description, interview_level)
+        if not match:
+            self._send_json(200, {"hit": False})
+            return
+        document, similarity = match
+        self._send_json(200, {
+            "hit": True,
+            "similarity": similarity,
+            "qa_content": document["qa_content"],
+            "title": make_title(job_description),
+            "doc_id": document.get("doc_id"),
+        })
+
+    def _handle_history(self, params):
+        limit = int(params.get("limit", 10))
+        if not 1 <= limit <= MAX_HISTORY_PAGE:
+            raise ValueError(f"limit must be between 1 and {MAX_HISTORY_PAGE}")
+        before_id = int(params["before_id"]) if "before_id" in params else None
+        entries = self.service.history_store.list_entries(limit=limit, before_id=before_id)
+        next_before_id = entries[-1]["id"] if len(entries) == limit else None
+        self._send_json(200, {"entries": entries, "next_before_id": next_before_id})
+
+    def _handle_history_entry(self, entry_id):
+        entry = self.service.history_store.get_entry(int(entry_id))
+        if entry is None:
+            self._send_json(404, {"error": "History entry not found"})
+            return
+        self._send_json(200, entry)
+
+
+def create_server(host, port, service):
+    handler = type("BoundQARequestHandler", (QARequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless JSON API for interview Q&A generation")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM generations")
+    parser.add_argument("--max-queue", type=int, default=32, help="Generations allowed to wait for a worker")
+    parser.add_argument("--fake-llm", action="store_true", help="Use a canned-response LLM instead of Gemini")
+    parser.add_argument("--fake-llm-latency", type=float, default=1.0, help="Seconds per fake LLM call")
+    parser.add_argument("--history-db", default=None, help="History database path (default: qa_history.db)")
+    args = parser.parse_args(argv)
+
+    service = QAService(
+        workers=args.workers,
+        max_queue=args.max_queue,
+        generate=FakeLLM(args.fake_llm_latency) if args.fake_llm else None,
+        history_store=HistoryStore(args.history_db),
+    )
+    service.warm_up()
+
+    server = create_server(args.host, args.port, service)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
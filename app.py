@@ -1,9 +1,11 @@
 import streamlit as st
-import json
-import os
-from utils.qa_generator import generate_or_retrieve_qa
+from utils.qa_generator import generate_or_retrieve_qa, INTERVIEW_LEVELS
+from utils.history_store import HistoryStore
+from utils.speech_component import speech_control
+from utils.speech_text import split_segments
+from utils.warmup import start_warmup
 from datetime import datetime
-import time
+import uuid
 
 # Page config with mobile-responsive settings
 st.set_page_config(
@@ -13,6 +15,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Load langchain, the embedding model and the vector store in the background
+# (once per process) so the page renders without waiting for them
+start_warmup()
+
 # Custom CSS for mobile responsiveness and modern UI
 st.markdown("""
 <style>
@@ -234,29 +240,68 @@ if 'voice_active' not in st.session_state:
     st.session_state.voice_active = False
 if 'tts_active' not in st.session_state:
     st.session_state.tts_active = False
+if 'history_page' not in st.session_state:
+    st.session_state.history_page = 0
+if 'speech_request' not in st.session_state:
+    st.session_state.speech_request = {"id": None, "action": None, "segments": None}
+if 'speech_error' not in st.session_state:
+    st.session_state.speech_error = ""
+
+# Sessions shown per sidebar page
+HISTORY_PAGE_SIZE = 10
 
-# File path for history
-HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'qa_history.json')
+@st.cache_resource
+def get_history_store():
+    """Shared SQLite history store (imports qa_history.json on first run)"""
+    return HistoryStore()
 
-def load_history_from_file():
-    try:
-        if os.path.exists(HISTORY_FILE):
-            with open(HISTORY_FILE, 'r') as f:
-                return json.load(f)
-    except Exception as e:
-        st.sidebar.error(f"Error loading history file: {str(e)}")
-    return []
+history_store = get_history_store()
 
-def save_history_to_file(history):
-    try:
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(history, f, indent=2)
-    except Exception as e:
-        st.sidebar.error(f"Error saving history file: {str(e)}")
+@st.cache_data(max_entries=32)
+def get_speech_segments(text):
+    """Split text into speakable segments once per distinct result"""
+    return split_segments(text)
 
-# Load history
-if 'history' not in st.session_state:
-    st.session_state.history = load_history_from_file()
+def request_speech(action, segments=None):
+    """Button callback: ask the browser speech widget to start an action"""
+    # Unique ids so a reloaded tab never mistakes a new request for one it already ran
+    st.session_state.speech_request = {"id": uuid.uuid4().hex, "action": action, "segments": segments}
+    st.session_state.speech_error = ""
+    st.session_state.voice_active = action == "listen"
+    st.session_state.tts_active = action == "speak"
+
+def handle_speech_event(event):
+    """Apply a completion event reported by the browser speech widget"""
+    request = st.session_state.speech_request
+    if not event or not request["action"] or event.get("request_id") != request["id"]:
+        return
+    # Done with this request; re-renders keep the id but carry no action
+    st.session_state.speech_request = {"id": request["id"], "action": None, "segments": None}
+    st.session_state.voice_active = False
+    st.session_state.tts_active = False
+    
+    event_type = event.get("type")
+    if event_type == "voice_complete":
+        transcript = event.get("transcript", "")
+        current_text = st.session_state.job_role
+        st.session_state.job_role = f"{current_text} {transcript}" if current_text else transcript
+    elif event_type == "voice_error":
+        if event.get("error") == "not_supported":
+            st.session_state.speech_error = "Speech recognition not supported. Please use Chrome browser."
+        elif event.get("error") != "no-speech":
+            st.session_state.speech_error = f"Voice input error: {event.get('error')}"
+    elif event_type == "speech_error" and event.get("error") == "not_supported":
+        st.session_state.speech_error = "Text-to-speech not supported in this browser."
+
+# Rendered before the inputs so a finished voice capture updates the text area in the same rerun
+speech_request = st.session_state.speech_request
+handle_speech_event(speech_control(
+    action=speech_request["action"],
+    segments=speech_request["segments"],
+    request_id=speech_request["id"]
+))
+# The widget keeps the segments for this request id; don't resend them on later reruns
+speech_request["segments"] = None
 
 # App header
 st.title("🎯 InterGeniX: AI Interviewer")
@@ -276,176 +321,29 @@ if job_role != st.session_state.job_role:
 col1, col2 = st.columns(2)
 
 with col1:
-    if st.button("🎤 Voice Input", use_container_width=True):
-        st.session_state.voice_active = True
-        
-        # Show listening status
-        status_placeholder = st.empty()
-        status_placeholder.markdown('<div class="voice-status listening">🎤 Listening... Speak now!</div>', unsafe_allow_html=True)
-        
-        # Create voice recognition component
-        voice_component = st.empty()
-        with voice_component.container():
-            st.components.v1.html(f"""
-            <div id="voice-recognition">
-                <script>
-                (function() {{
-                    if ('webkitSpeechRecognition' in window) {{
-                        const recognition = new webkitSpeechRecognition();
-                        recognition.lang = 'en-US';
-                        recognition.interimResults = false;
-                        recognition.maxAlternatives = 1;
-                        recognition.continuous = false;
-                        
-                        recognition.onresult = function(event) {{
-                            const transcript = event.results[0][0].transcript;
-                            const currentText = `{st.session_state.job_role}`;
-                            const newText = currentText ? currentText + ' ' + transcript : transcript;
-                            
-                            // Update the text area
-                            const textareas = parent.document.querySelectorAll('textarea');
-                            if (textareas.length > 0) {{
-                                textareas[0].value = newText;
-                                textareas[0].dispatchEvent(new Event('input', {{ bubbles: true }}));
-                                textareas[0].dispatchEvent(new Event('change', {{ bubbles: true }}));
-                            }}
-                            
-                            // Send completion signal
-                            parent.postMessage({{
-                                type: 'voice_complete',
-                                transcript: newText
-                            }}, '*');
-                        }};
-                        
-                        recognition.onerror = function(event) {{
-                            console.error('Speech recognition error:', event.error);
-                            parent.postMessage({{
-                                type: 'voice_error',
-                                error: event.error
-                            }}, '*');
-                        }};
-                        
-                        recognition.onend = function() {{
-                            parent.postMessage({{
-                                type: 'voice_ended'
-                            }}, '*');
-                        }};
-                        
-                        recognition.start();
-                        
-                        // Auto-stop after 10 seconds
-                        setTimeout(function() {{
-                            recognition.stop();
-                        }}, 10000);
-                        
-                    }} else {{
-                        alert('Speech recognition not supported. Please use Chrome browser.');
-                        parent.postMessage({{
-                            type: 'voice_error',
-                            error: 'not_supported'
-                        }}, '*');
-                    }}
-                }})();
-                </script>
-            </div>
-            """, height=50)
-        
-        # Wait for a moment then clear
-        time.sleep(3)
-        status_placeholder.empty()
-        voice_component.empty()
-        st.session_state.voice_active = False
+    st.button("🎤 Voice Input", use_container_width=True,
+              on_click=request_speech, args=("listen",))
 
 with col2:
     if st.button("🔊 Read Text", use_container_width=True):
         if st.session_state.job_role.strip():
-            st.session_state.tts_active = True
-            
-            # Show speaking status
-            status_placeholder = st.empty()
-            status_placeholder.markdown('<div class="voice-status speaking">🔊 Reading text...</div>', unsafe_allow_html=True)
-            
-            # Create TTS component
-            tts_component = st.empty()
-            with tts_component.container():
-                # Clean text for speech
-                clean_text = st.session_state.job_role.replace('\n', ' ').replace('"', '\\"').replace("'", "\\'").strip()
-                
-                st.components.v1.html(f"""
-                <div id="text-to-speech">
-                    <script>
-                    (function() {{
-                        if ('speechSynthesis' in window) {{
-                            const text = `{clean_text}`;
-                            
-                            // Cancel any existing speech
-                            window.speechSynthesis.cancel();
-                            
-                            if (text.trim()) {{
-                                const utterance = new SpeechSynthesisUtterance(text);
-                                utterance.lang = 'en-US';
-                                utterance.rate = 0.9;
-                                utterance.pitch = 1;
-                                
-                                utterance.onend = function() {{
-                                    parent.postMessage({{
-                                        type: 'speech_complete'
-                                    }}, '*');
-                                }};
-                                
-                                utterance.onerror = function() {{
-                                    parent.postMessage({{
-                                        type: 'speech_error'
-                                    }}, '*');
-                                }};
-                                
-                                window.speechSynthesis.speak(utterance);
-                            }} else {{
-                                parent.postMessage({{
-                                    type: 'speech_error'
-                                }}, '*');
-                            }}
-                        }} else {{
-                            alert('Text-to-speech not supported in this browser.');
-                            parent.postMessage({{
-                                type: 'speech_error'
-                            }}, '*');
-                        }}
-                    }})();
-                    </script>
-                </div>
-                """, height=50)
-            
-            # Wait for speech to complete
-            time.sleep(5)
-            status_placeholder.empty()
-            tts_component.empty()
-            st.session_state.tts_active = False
+            request_speech("speak", get_speech_segments(st.session_state.job_role))
+            st.rerun()
         else:
             st.warning("Please enter some text to read aloud.")
 
-# Message listener for JavaScript callbacks
-st.components.v1.html("""
-<script>
-window.addEventListener('message', function(event) {
-    if (event.data.type === 'voice_complete') {
-        console.log('Voice recognition completed:', event.data.transcript);
-    } else if (event.data.type === 'voice_error') {
-        console.error('Voice recognition error:', event.data.error);
-    } else if (event.data.type === 'voice_ended') {
-        console.log('Voice recognition ended');
-    } else if (event.data.type === 'speech_complete') {
-        console.log('Text-to-speech completed');
-    } else if (event.data.type === 'speech_error') {
-        console.error('Text-to-speech error');
-    }
-});
-</script>
-""", height=0)
+# Speech status (cleared when the browser reports completion)
+if st.session_state.voice_active:
+    st.markdown('<div class="voice-status listening">🎤 Listening... Speak now!</div>', unsafe_allow_html=True)
+elif st.session_state.tts_active:
+    st.markdown('<div class="voice-status speaking">🔊 Reading...</div>', unsafe_allow_html=True)
+    st.button("⏹️ Stop Reading", on_click=request_speech, args=("stop",))
+if st.session_state.speech_error:
+    st.warning(st.session_state.speech_error)
 
 # Interview level selection
 interview_level = st.selectbox("🎚️ Interview Level", 
-                              ["entry", "mid", "senior"], 
+                              INTERVIEW_LEVELS, 
                               index=0)
 
 # Generate button
@@ -461,15 +359,14 @@ with col1:
                     st.session_state.submitted = True
                     
                     # Save to history
-                    new_entry = {
-                        "timestamp": datetime.now().isoformat(),
-                        "job_role": st.session_state.job_role,
-                        "interview_level": interview_level,
-                        "title": title,
-                        "result": result
-                    }
-                    st.session_state.history.insert(0, new_entry)
-                    save_history_to_file(st.session_state.history)
+                    history_store.add_entry(
+                        st.session_state.job_role,
+                        interview_level,
+                        title,
+                        result,
+                        timestamp=datetime.now().isoformat()
+                    )
+                    st.session_state.history_page = 0
                     
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
@@ -497,65 +394,9 @@ if st.session_state.submitted and st.session_state.result:
     
     # Response voice control button
     if st.button("🔊 Read Response"):
-        # Show speaking status
-        status_placeholder = st.empty()
-        status_placeholder.markdown('<div class="voice-status speaking">🔊 Reading response...</div>', unsafe_allow_html=True)
-        
-        # Create response TTS component
-        response_component = st.empty()
-        with response_component.container():
-            # Clean the result text for speech
-            clean_result = st.session_state.result.replace('#', '').replace('*', '').replace('`', '').replace('\n', ' ').replace('"', '\\"').replace("'", "\\'").strip()
-            
-            st.components.v1.html(f"""
-            <div id="response-speech">
-                <script>
-                (function() {{
-                    if ('speechSynthesis' in window) {{
-                        const text = `{clean_result}`;
-                        
-                        // Cancel any existing speech
-                        window.speechSynthesis.cancel();
-                        
-                        if (text.trim()) {{
-                            const utterance = new SpeechSynthesisUtterance(text);
-                            utterance.lang = 'en-US';
-                            utterance.rate = 0.9;
-                            utterance.pitch = 1;
-                            
-                            utterance.onend = function() {{
-                                parent.postMessage({{
-                                    type: 'response_speech_complete'
-                                }}, '*');
-                            }};
-                            
-                            utterance.onerror = function() {{
-                                parent.postMessage({{
-                                    type: 'response_speech_error'
-                                }}, '*');
-                            }};
-                            
-                            window.speechSynthesis.speak(utterance);
-                        }} else {{
-                            parent.postMessage({{
-                                type: 'response_speech_error'
-                            }}, '*');
-                        }}
-                    }} else {{
-                        alert('Text-to-speech not supported in this browser.');
-                        parent.postMessage({{
-                            type: 'response_speech_error'
-                        }}, '*');
-                    }}
-                }})();
-                </script>
-            </div>
-            """, height=50)
-        
-        # Wait for speech to complete (longer for response)
-        time.sleep(8)
-        status_placeholder.empty()
-        response_component.empty()
+        # Segmented by question so playback starts at once and can skip between questions
+        request_speech("speak", get_speech_segments(st.session_state.result))
+        st.rerun()
     
     # Download button
     if st.download_button("💾 Save to file", 
@@ -567,23 +408,43 @@ if st.session_state.submitted and st.session_state.result:
 with st.sidebar:
     st.header("📚 Previous Sessions")
     
-    if st.session_state.history:
+    # Fetch one extra summary to know whether an older page exists
+    page = st.session_state.history_page
+    entries = history_store.list_entries(limit=HISTORY_PAGE_SIZE + 1, offset=page * HISTORY_PAGE_SIZE)
+    has_older = len(entries) > HISTORY_PAGE_SIZE
+    entries = entries[:HISTORY_PAGE_SIZE]
+    
+    if entries:
         if st.button("🗑️ Clear All History", key="clear_history"):
-            st.session_state.history = []
-            save_history_to_file([])
+            history_store.clear()
+            st.session_state.history_page = 0
             st.rerun()
         
-        for i, entry in enumerate(st.session_state.history[:10]):  # Show last 10
-            with st.expander(f"📝 {entry.get('title', 'Untitled')[:30]}..."):
-                st.write(f"**Level:** {entry.get('interview_level', 'N/A')}")
-                st.write(f"**Date:** {entry.get('timestamp', 'N/A')[:19]}")
-                if st.button(f"Load Session", key=f"load_{i}"):
-                    # Properly load the session data
-                    st.session_state.job_role = entry.get('job_role', '')
-                    st.session_state.result = entry.get('result', '')
+        for entry in entries:
+            with st.expander(f"📝 {(entry.get('title') or 'Untitled')[:30]}..."):
+                st.write(f"**Level:** {entry.get('interview_level') or 'N/A'}")
+                st.write(f"**Date:** {(entry.get('timestamp') or 'N/A')[:19]}")
+                if st.button(f"Load Session", key=f"load_{entry['id']}"):
+                    # Load the full result only when the session is opened
+                    full_entry = history_store.get_entry(entry['id']) or {}
+                    st.session_state.job_role = full_entry.get('job_role', '')
+                    st.session_state.result = full_entry.get('result', '')
                     st.session_state.submitted = True
                     st.session_state.from_cache = True
                     st.rerun()
+        
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            if page > 0 and st.button("◀ Newer", key="history_newer"):
+                st.session_state.history_page -= 1
+                st.rerun()
+        with next_col:
+            if has_older and st.button("Older ▶", key="history_older"):
+                st.session_state.history_page += 1
+                st.rerun()
+    elif page > 0:
+        st.session_state.history_page = 0
+        st.rerun()
     else:
         st.write("No previous sessions found.")
 
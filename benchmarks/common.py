@@ -0,0 +1,88 @@
+"""Shared helpers for the offline benchmark and replay scripts."""
+import random
+import time
+
+ROLES = [
+    "Python Developer", "Data Scientist", "Frontend Engineer", "DevOps Engineer",
+    "Machine Learning Engineer", "Product Manager", "QA Automation Engineer",
+    "Backend Engineer", "Data Engineer", "Mobile Developer", "Security Analyst",
+    "Cloud Architect", "Site Reliability Engineer", "Full Stack Developer",
+]
+SKILLS = [
+    "Django", "FastAPI", "React", "TypeScript", "Kubernetes", "Docker", "AWS",
+    "GCP", "Terraform", "PostgreSQL", "MongoDB", "Spark", "Airflow", "PyTorch",
+    "TensorFlow", "scikit-learn", "Kafka", "Redis", "GraphQL", "CI/CD",
+    "Selenium", "Swift", "Kotlin", "Go", "Rust", "Java", "Spring Boot", "Linux",
+]
+DOMAINS = ["fintech", "healthcare", "e-commerce", "gaming", "logistics", "edtech", "SaaS", "media"]
+LEVELS = ["entry", "mid", "senior"]
+
+
+class StubLLM:
+    """Counts generation calls instead of calling Gemini"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate(self, job_description, interview_level):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return f"## Technical Questions\n\n**Q1: Stub question for {interview_level} {job_description[:40]}**\nA: Stub answer"
+
+
+def preload_search_dependencies():
+    """Import what the lookup path loads lazily so it isn't timed as part of the first lookup
+
+    sklearn is imported by SimpleVectorStore.find_similar and streamlit by the
+    qa_generator config getters (which fall back to the environment without it).
+    """
+    import sklearn.metrics.pairwise  # noqa: F401
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def latency_summary(latencies_ms):
+    """p50/p95/mean and throughput for a list of per-operation latencies"""
+    total_ms = sum(latencies_ms)
+    return {
+        'count': len(latencies_ms),
+        'p50_ms': percentile(latencies_ms, 50),
+        'p95_ms': percentile(latencies_ms, 95),
+        'mean_ms': total_ms / len(latencies_ms) if latencies_ms else 0.0,
+        'ops_per_sec': len(latencies_ms) / (total_ms / 1000) if total_ms else 0.0,
+    }
+
+
+def synthetic_job_descriptions(count, seed=0):
+    """Deterministic synthetic (job_description, interview_level) pairs"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        role = rng.choice(ROLES)
+        skills = ", ".join(rng.sample(SKILLS, 4))
+        domain = rng.choice(DOMAINS)
+        years = rng.randint(0, 12)
+        job_description = (
+            f"{role} for a {domain} company (req {i}). Requires {skills}. "
+            f"{years}+ years of experience building and operating production systems."
+        )
+        corpus.append((job_description, rng.choice(LEVELS)))
+    return corpus
+
+
+def paraphrase(job_description):
+    """A lightly reworded query that should still hit the cache"""
+    return "Hiring: " + job_description.replace("Requires", "Must know").replace("years of experience", "yrs experience")
@@ -0,0 +1,211 @@
+"""
+Offline replay of (job description, level) queries against a vector store snapshot.
+
+Replays a query log through SimpleVectorStore with a stub LLM standing in for
+Gemini, sweeping similarity thresholds and embedding backends, and reports the
+cache hit rate, lookup latency and how many LLM calls the cache avoided.
+
+Usage:
+    python -m benchmarks.replay_cache --queries qa_history.json --snapshot . \\
+        --thresholds 0.7 0.75 0.8 0.85 0.9 --backends all-MiniLM-L6-v2 hashing
+    python -m benchmarks.replay_cache --synthetic 400 --backends hashing
+
+The query log is either a JSON list (e.g. qa_history.json) or a JSONL file,
+with ``job_description`` (or ``job_role``) and ``interview_level`` per entry.
+An optional ``group`` labels queries that should share one cached answer:
+a hit on an entry generated for a different group is counted as a false hit,
+so the table shows precision alongside hit rate (a lower threshold always
+raises the hit rate). ``--synthetic N`` replays a labelled synthetic log of
+N queries instead of a file.
+The snapshot directory holds vector_data.json; its embeddings are recomputed
+for every backend so that backends are compared on equal terms. Nothing is
+written back to the snapshot.
+"""
+import argparse
+import copy
+import json
+import os
+import time
+from benchmarks.common import (
+    StubLLM,
+    paraphrase,
+    percentile,
+    preload_search_dependencies,
+    synthetic_job_descriptions,
+)
+from utils.embeddings import DEFAULT_MODEL_NAME, load_embedding_model
+from utils.simple_vector_store import SimpleVectorStore
+
+DEFAULT_THRESHOLDS = [0.7, 0.75, 0.8, 0.85, 0.9]
+
+
+def load_queries(path):
+    """Load (job_description, interview_level, group) tuples in chronological order
+
+    group is None for unlabelled entries.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            entries = json.load(f)
+
+    # qa_history.json is stored newest first
+    if entries and all('timestamp' in entry for entry in entries):
+        entries = sorted(entries, key=lambda entry: entry['timestamp'])
+
+    queries = []
+    for entry in entries:
+        job_description = entry.get('job_description') or entry.get('job_role')
+        if job_description and job_description.strip():
+            queries.append((job_description, entry.get('interview_level', 'entry'), entry.get('group')))
+    return queries
+
+
+def synthetic_queries(count, seed=0):
+    """Labelled log: distinct synthetic JDs, then a paraphrase of each in the same group"""
+    corpus = synthetic_job_descriptions(count // 2, seed=seed)
+    queries = [(jd, level, str(i)) for i, (jd, level) in enumerate(corpus)]
+    queries += [(paraphrase(jd), level, str(i)) for i, (jd, level) in enumerate(corpus)]
+    return queries
+
+
+def build_base_store(snapshot_dir, backend):
+    """Load the snapshot documents and embed them with the given backend"""
+    store = SimpleVectorStore(
+        data_dir=snapshot_dir,
+        model=load_embedding_model(backend),
+        persist=False
+    )
+    if not snapshot_dir:
+        store.documents = []
+    store.reindex()
+    return store
+
+
+def clone_store(store):
+    """Copy a store so that one replay's inserts do not leak into the next"""
+    clone = copy.copy(store)
+    clone.documents = list(store.documents)
+    clone.embeddings = list(store.embeddings)
+    return clone
+
+
+def replay(store, queries, threshold, llm):
+    """Replay queries against the store, generating and inserting on misses
+
+    A hit is labelled when both the query and the matched entry have a group
+    (snapshot documents may carry one; replayed inserts take their query's);
+    a labelled hit on a different group served the wrong Q&A.
+    """
+    latencies = []
+    hits = 0
+    near_hits = 0
+    labelled_hits = 0
+    false_hits = 0
+    calls_before = llm.calls
+    groups = {doc['doc_id']: doc['group'] for doc in store.documents if doc.get('group') is not None}
+
+    for job_description, interview_level, group in queries:
+        start = time.perf_counter()
+        match = store.find_similar(job_description, interview_level, threshold)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        if match:
+            hits += 1
+            doc, _ = match
+            if doc['doc_id'] != store._generate_doc_id(job_description, interview_level):
+                near_hits += 1
+            matched_group = groups.get(doc['doc_id'])
+            if group is not None and matched_group is not None:
+                labelled_hits += 1
+                false_hits += matched_group != group
+        else:
+            qa_content = llm.generate(job_description, interview_level)
+            store.add_document(job_description, qa_content, interview_level)
+            if group is not None:
+                groups[store._generate_doc_id(job_description, interview_level)] = group
+
+    total = len(queries)
+    llm_calls = llm.calls - calls_before
+    false_hit_rate = false_hits / labelled_hits if labelled_hits else None
+    return {
+        'threshold': threshold,
+        'queries': total,
+        'hits': hits,
+        'near_hits': near_hits,
+        'hit_rate': hits / total if total else 0.0,
+        'labelled_hits': labelled_hits,
+        'false_hits': false_hits,
+        'false_hit_rate': false_hit_rate,
+        'precision': 1.0 - false_hit_rate if false_hit_rate is not None else None,
+        'p50_lookup_ms': percentile(latencies, 50),
+        'p95_lookup_ms': percentile(latencies, 95),
+        'llm_calls': llm_calls,
+        'llm_calls_avoided': total - llm_calls,
+        'llm_seconds_avoided': (total - llm_calls) * llm.latency,
+    }
+
+
+def run_sweep(queries, snapshot_dir, backends, thresholds, llm_latency=0.0):
+    """Replay every (backend, threshold) combination and return result rows"""
+    results = []
+    for backend in backends:
+        base = build_base_store(snapshot_dir, backend)
+        for threshold in thresholds:
+            llm = StubLLM(latency=llm_latency)
+            row = replay(clone_store(base), queries, threshold, llm)
+            row['backend'] = backend
+            row['snapshot_documents'] = len(base.documents)
+            results.append(row)
+    return results
+
+
+def format_table(results):
+    header = (
+        f"{'backend':<24} {'thresh':>6} {'hits':>6} {'near':>5} {'hit%':>6} {'false':>5} {'false%':>6} "
+        f"{'p50ms':>8} {'p95ms':>8} {'llm':>5} {'saved':>6}"
+    )
+    lines = [header, '-' * len(header)]
+    for row in results:
+        # false% is over labelled hits; "-" when the log has no group labels
+        false_rate = row['false_hit_rate']
+        false_pct = f"{false_rate * 100:>5.1f}%" if false_rate is not None else f"{'-':>6}"
+        lines.append(
+            f"{row['backend'][:24]:<24} {row['threshold']:>6.2f} {row['hits']:>6} {row['near_hits']:>5} "
+            f"{row['hit_rate'] * 100:>5.1f}% {row['false_hits']:>5} {false_pct} "
+            f"{row['p50_lookup_ms']:>8.2f} {row['p95_lookup_ms']:>8.2f} "
+            f"{row['llm_calls']:>5} {row['llm_calls_avoided']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a query log to tune the cache similarity threshold")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--queries', help="JSON or JSONL query log (e.g. qa_history.json)")
+    source.add_argument('--synthetic', type=int, metavar='N', help="Replay N labelled synthetic queries instead")
+    parser.add_argument('--snapshot', default=None, help="Directory containing vector_data.json (default: empty store)")
+    parser.add_argument('--thresholds', type=float, nargs='+', default=DEFAULT_THRESHOLDS)
+    parser.add_argument('--backends', nargs='+', default=[DEFAULT_MODEL_NAME],
+                        help="Sentence-transformers model names, or 'hashing' for the offline stand-in")
+    parser.add_argument('--llm-latency', type=float, default=0.0,
+                        help="Simulated seconds per stub LLM call")
+    parser.add_argument('--json', dest='json_path', default=None, help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.snapshot and not os.path.exists(os.path.join(args.snapshot, "vector_data.json")):
+        parser.error(f"No vector_data.json in {args.snapshot}")
+
+    preload_search_dependencies()
+    queries = synthetic_queries(args.synthetic) if args.synthetic else load_queries(args.queries)
+    results = run_sweep(queries, args.snapshot, args.backends, args.thresholds, args.llm_latency)
+
+    print(format_table(results))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Reproducible offline benchmark suite.
+
+Covers SimpleVectorStore scaling on synthetic job-description corpora
+(search_similar / add_document latency and throughput, load/save time and
+RSS), cold-import time of the app's dependencies, and end-to-end
+generate_or_retrieve_qa latency with a stub LLM. Everything runs offline with
+the hashing embeddings by default; results are written as JSON so runs from
+different commits can be compared.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000 --quick
+    python -m benchmarks.run_benchmarks --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.common import (
+    StubLLM,
+    latency_summary,
+    paraphrase,
+    preload_search_dependencies,
+    synthetic_job_descriptions,
+)
+from utils.embeddings import HASHING_BACKEND, load_embedding_model
+from utils.simple_vector_store import SimpleVectorStore
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+COLD_IMPORT_MODULES = [
+    "streamlit",
+    "langchain_google_genai",
+    "sentence_transformers",
+    "utils.simple_vector_store",
+    "utils.qa_generator",
+]
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (Linux /proc, else peak RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux and bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def build_store(corpus, directory, model):
+    """Populate a store in one batch (not via add_document, which saves every time)"""
+    store = SimpleVectorStore(data_dir=directory, model=model, persist=True)
+    store.documents = []
+    store.embeddings = []
+    for job_description, interview_level in corpus:
+        store.documents.append({
+            'doc_id': store._generate_doc_id(job_description, interview_level),
+            'job_description': job_description,
+            'qa_content': f"Q&A for {job_description}",
+            'interview_level': interview_level,
+            'timestamp': datetime.now().isoformat()
+        })
+    store.reindex()
+    return store
+
+
+def bench_store_size(size, model, search_ops, add_ops, seed):
+    """search/add latency, save/load time and RSS for one corpus size"""
+    corpus = synthetic_job_descriptions(size, seed=seed)
+    rng = random.Random(seed)
+    result = {'documents': size}
+
+    with tempfile.TemporaryDirectory() as directory:
+        store, result['build_ms'] = timed(build_store, corpus, directory, model)
+
+        _, result['save_ms'] = timed(store.save_data)
+        result['data_file_mb'] = os.path.getsize(store.data_file) / (1024 * 1024)
+        result['embeddings_file_mb'] = os.path.getsize(store.embeddings_file) / (1024 * 1024)
+        del store
+
+        rss_before = current_rss_mb()
+        store, result['load_ms'] = timed(SimpleVectorStore, directory, model, True)
+        result['rss_after_load_mb'] = current_rss_mb()
+        result['rss_load_delta_mb'] = result['rss_after_load_mb'] - rss_before
+
+        # Half near-duplicates of stored JDs (hits), half unseen JDs (misses)
+        queries = [(paraphrase(jd), level) for jd, level in rng.sample(corpus, min(search_ops // 2, size))]
+        queries += synthetic_job_descriptions(search_ops - len(queries), seed=seed + 1)
+        latencies = []
+        hits = 0
+        for job_description, interview_level in queries:
+            match, elapsed = timed(store.find_similar, job_description, interview_level)
+            latencies.append(elapsed)
+            hits += bool(match)
+        result['search'] = latency_summary(latencies)
+        result['search']['hit_rate'] = hits / len(queries) if queries else 0.0
+
+        new_docs = synthetic_job_descriptions(add_ops, seed=seed + 2)
+        latencies = [timed(store.add_document, jd, "new content", level)[1] for jd, level in new_docs]
+        result['add'] = latency_summary(latencies)
+    return result
+
+
+def bench_cold_imports(modules):
+    """Import time of each module in a fresh interpreter"""
+    results = {}
+    for module in modules:
+        code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+        process = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True
+        )
+        if process.returncode == 0:
+            results[module] = {'import_ms': float(process.stdout.strip().splitlines()[-1])}
+        else:
+            error = process.stderr.strip().splitlines()
+            results[module] = {'error': error[-1] if error else f"exit code {process.returncode}"}
+    return results
+
+
+def bench_end_to_end(model, size, ops, seed):
+    """generate_or_retrieve_qa latency for cache hits and misses with a stub LLM
+
+    Calls are classified by the from_cache flag they return, not by which
+    query set they came from. Sibling-level prefetching and stale-while-
+    revalidate are switched off so no background LLM work overlaps the timings.
+    """
+    try:
+        from utils import qa_generator
+    except ImportError as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+    corpus = synthetic_job_descriptions(size, seed=seed)
+    llm = StubLLM()
+    latencies = {True: [], False: []}
+    background_modes = (qa_generator.get_prefetch_sibling_levels, qa_generator.get_refresh_after_seconds)
+    with tempfile.TemporaryDirectory() as directory:
+        store = build_store(corpus, directory, model)
+        store.persist = False
+        qa_generator.set_vector_store(store)
+        qa_generator.get_prefetch_sibling_levels = lambda: False
+        qa_generator.get_refresh_after_seconds = lambda: None
+        try:
+            rng = random.Random(seed)
+            queries = rng.sample(corpus, min(ops, size)) + synthetic_job_descriptions(ops, seed=seed + 3)
+            for job_description, interview_level in queries:
+                (_, from_cache, _), elapsed = timed(
+                    qa_generator.generate_or_retrieve_qa, job_description, interview_level, llm.generate
+                )
+                latencies[from_cache].append(elapsed)
+        finally:
+            qa_generator.set_vector_store(None)
+            qa_generator.get_prefetch_sibling_levels, qa_generator.get_refresh_after_seconds = background_modes
+    return {
+        'documents': size,
+        'hit': latency_summary(latencies[True]),
+        'miss': latency_summary(latencies[False]),
+        'llm_calls': llm.calls,
+    }
+
+
+def compare(before_path, after_path):
+    """Print p50 latency ratios (after / before) for matching benchmarks"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    def p50s(report):
+        values = {}
+        for row in report['results']['store']:
+            for op in ('search', 'add'):
+                values[f"store[{row['documents']}].{op}.p50_ms"] = row[op]['p50_ms']
+            for key in ('load_ms', 'save_ms'):
+                values[f"store[{row['documents']}].{key}"] = row[key]
+        for module, row in report['results']['cold_import'].items():
+            if 'import_ms' in row:
+                values[f"import[{module}]"] = row['import_ms']
+        e2e = report['results']['end_to_end']
+        for path in ('hit', 'miss'):
+            if path in e2e:
+                values[f"end_to_end.{path}.p50_ms"] = e2e[path]['p50_ms']
+        return values
+
+    old, new = p50s(before), p50s(after)
+    print(f"{'metric':<44} {'before':>10} {'after':>10} {'ratio':>7}")
+    for key in sorted(set(old) & set(new)):
+        ratio = new[key] / old[key] if old[key] else float('inf')
+        print(f"{key:<44} {old[key]:>10.2f} {new[key]:>10.2f} {ratio:>6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--search-ops', type=int, default=200)
+    parser.add_argument('--add-ops', type=int, default=20)
+    parser.add_argument('--e2e-ops', type=int, default=50)
+    parser.add_argument('--embedding', default=HASHING_BACKEND,
+                        help="Embedding backend ('hashing' or a sentence-transformers model name)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help="Fewer operations per benchmark")
+    parser.add_argument('--skip-imports', action='store_true', help="Skip the cold-import benchmark")
+    parser.add_argument('--output', default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="Compare two JSON reports")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.quick:
+        args.search_ops, args.add_ops, args.e2e_ops = 50, 5, 10
+
+    preload_search_dependencies()
+    model = load_embedding_model(args.embedding)
+    results = {'store': []}
+    for size in args.sizes:
+        print(f"store: {size} documents...", file=sys.stderr)
+        results['store'].append(bench_store_size(size, model, args.search_ops, args.add_ops, args.seed))
+
+    print("cold imports...", file=sys.stderr)
+    results['cold_import'] = {} if args.skip_imports else bench_cold_imports(COLD_IMPORT_MODULES)
+
+    print("end to end...", file=sys.stderr)
+    results['end_to_end'] = bench_end_to_end(model, min(args.sizes), args.e2e_ops, args.seed)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'embedding': args.embedding,
+            'seed': args.seed,
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
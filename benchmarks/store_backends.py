@@ -0,0 +1,100 @@
+"""
+Insert and search workloads against every vector store backend.
+
+Each backend is created in a temporary directory with the offline hashing
+embeddings, so no model download or API key is needed and the backends are
+compared on identical vectors. Backends whose dependencies are not installed
+are reported as skipped.
+
+Usage:
+    python -m benchmarks.store_backends --documents 1000 --queries 500 --json backends.json
+"""
+import argparse
+import json
+import tempfile
+import time
+from benchmarks.common import latency_summary, paraphrase, preload_search_dependencies, synthetic_job_descriptions
+from utils.embeddings import HashingEmbeddings
+from utils.store_base import BACKENDS, DEFAULT_SIMILARITY_THRESHOLD, create_vector_store
+
+
+def make_store(backend, directory, embeddings):
+    if backend == "simple":
+        return create_vector_store(backend, data_dir=directory, model=embeddings)
+    return create_vector_store(backend, persist_directory=directory, embedding_function=embeddings)
+
+
+def run_backend(backend, corpus, queries, threshold):
+    embeddings = HashingEmbeddings()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            store = make_store(backend, directory, embeddings)
+        except ImportError as e:
+            return {'backend': backend, 'skipped': str(e)}
+
+        insert_latencies = []
+        for job_description, interview_level in corpus:
+            start = time.perf_counter()
+            store.add_document(job_description, f"Q&A for {job_description}", interview_level)
+            insert_latencies.append((time.perf_counter() - start) * 1000)
+
+        search_latencies = []
+        hits = 0
+        similarities = []
+        for job_description, interview_level in queries:
+            start = time.perf_counter()
+            match = store.find_similar(job_description, interview_level, threshold)
+            search_latencies.append((time.perf_counter() - start) * 1000)
+            if match:
+                hits += 1
+                similarities.append(match[1])
+
+    return {
+        'backend': backend,
+        'documents': len(corpus),
+        'threshold': threshold,
+        'insert': latency_summary(insert_latencies),
+        'search': latency_summary(search_latencies),
+        'hits': hits,
+        'hit_rate': hits / len(queries) if queries else 0.0,
+        'mean_hit_similarity': sum(similarities) / len(similarities) if similarities else None,
+    }
+
+
+def build_queries(corpus, count):
+    """Half paraphrases of stored documents (expected hits), half unseen JDs"""
+    repeated = [(paraphrase(jd), level) for jd, level in corpus[:count // 2]]
+    novel = synthetic_job_descriptions(count - len(repeated), seed=1)
+    return repeated + novel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark insert/search across vector store backends")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--documents', type=int, default=1000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_SIMILARITY_THRESHOLD)
+    parser.add_argument('--json', dest='json_path', default=None, help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    preload_search_dependencies()
+    corpus = synthetic_job_descriptions(args.documents)
+    queries = build_queries(corpus, args.queries)
+    results = [run_backend(backend, corpus, queries, args.threshold) for backend in args.backends]
+
+    for row in results:
+        if 'skipped' in row:
+            print(f"{row['backend']:<8} skipped: {row['skipped']}")
+            continue
+        print(
+            f"{row['backend']:<8} insert p50 {row['insert']['p50_ms']:.2f}ms p95 {row['insert']['p95_ms']:.2f}ms | "
+            f"search p50 {row['search']['p50_ms']:.2f}ms p95 {row['search']['p95_ms']:.2f}ms "
+            f"({row['search']['ops_per_sec']:.0f}/s) | hit rate {row['hit_rate'] * 100:.1f}%"
+        )
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import asyncio
+import queue
+import threading
+import time
+import wave
+from collections import deque, namedtuple
+import numpy as np
+import speech_recognition as sr
+
+DEFAULT_SAMPLE_RATE = 16000
+DEFAULT_FRAME_DURATION = 0.03  # seconds of audio per frame
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+# text is None when recognition failed; error then holds the reason
+Phrase = namedtuple("Phrase", ["text", "start", "end", "error"])
+
+class WavFileSource:
+    """Frames of 16-bit mono PCM read from a WAV file
+
+    Multi-channel files are mixed down to mono. With realtime=True frames are
+    paced like a live microphone; otherwise the file is read as fast as possible.
+    """
+
+    def __init__(self, path, frame_duration=DEFAULT_FRAME_DURATION, realtime=False):
+        self.path = path
+        self.frame_duration = frame_duration
+        self.realtime = realtime
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+            self.sample_rate = wav.getframerate()
+            self.channels = wav.getnchannels()
+
+    def frames(self):
+        samples_per_frame = int(self.sample_rate * self.frame_duration)
+        with wave.open(self.path, 'rb') as wav:
+            while True:
+                data = wav.readframes(samples_per_frame)
+                if not data:
+                    return
+                if self.channels > 1:
+                    samples = np.frombuffer(data, dtype=np.int16).reshape(-1, self.channels)
+                    data = samples.mean(axis=1).astype(np.int16).tobytes()
+                if self.realtime:
+                    time.sleep(self.frame_duration)
+                yield data
+
+class MicrophoneSource:
+    """Frames of 16-bit mono PCM from a microphone, opened once for the whole stream"""
+
+    def __init__(self, device_index=None, sample_rate=DEFAULT_SAMPLE_RATE, frame_duration=DEFAULT_FRAME_DURATION):
+        self.device_index = device_index
+        self.sample_rate = sample_rate
+        self.frame_duration = frame_duration
+        self._stopped = threading.Event()
+
+    def frames(self):
+        samples_per_frame = int(self.sample_rate * self.frame_duration)
+        microphone = sr.Microphone(device_index=self.device_index, sample_rate=self.sample_rate,
+                                   chunk_size=samples_per_frame)
+        with microphone as source:
+            while not self._stopped.is_set():
+                yield source.stream.read(samples_per_frame)
+
+    def stop(self):
+        self._stopped.set()
+
+def frame_energy(frame):
+    """RMS energy of a 16-bit PCM frame"""
+    samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+    if not samples.size:
+        return 0.0
+    return float(np.sqrt(np.mean(samples * samples)))
+
+class EnergyVAD:
+    """Energy-based voice activity detection that segments frames into phrases
+
+    The noise floor is calibrated once from the first calibration_duration
+    seconds, then tracked with an exponential moving average over non-speech
+    frames so the threshold adapts as background noise changes. A frame is
+    speech when its energy exceeds noise_floor * sensitivity.
+    """
+
+    def __init__(self, frame_duration=DEFAULT_FRAME_DURATION, calibration_duration=0.5, sensitivity=3.0,
+                 min_energy=100.0, adapt_rate=0.05, pause_duration=0.8, min_phrase_duration=0.3,
+                 max_phrase_duration=30.0, pre_roll_duration=0.3):
+        self.frame_duration = frame_duration
+        self.sensitivity = sensitivity
+        self.min_energy = min_energy
+        self.adapt_rate = adapt_rate
+        self.calibration_frames = max(1, int(calibration_duration / frame_duration))
+        self.pause_frames = max(1, int(pause_duration / frame_duration))
+        self.min_phrase_frames = max(1, int(min_phrase_duration / frame_duration))
+        self.max_phrase_frames = max(1, int(max_phrase_duration / frame_duration))
+        self.noise_floor = None
+        self._calibration = []
+        self._pre_roll = deque(maxlen=max(0, int(pre_roll_duration / frame_duration)))
+        self._phrase = None
+        self._silent_frames = 0
+        self._speech_frames = 0
+        self._frame_index = 0
+        self._phrase_start = 0
+
+    @property
+    def threshold(self):
+        return max(self.min_energy, (self.noise_floor or 0.0) * self.sensitivity)
+
+    def process(self, frame):
+        """Feed one frame; returns (audio_bytes, start_seconds, end_seconds) when a phrase ends"""
+        index = self._frame_index
+        self._frame_index += 1
+        energy = frame_energy(frame)
+
+        if self.noise_floor is None:
+            self._calibration.append(energy)
+            if len(self._calibration) >= self.calibration_frames:
+                self.noise_floor = float(np.mean(self._calibration))
+                self._calibration = []
+            self._pre_roll.append(frame)
+            return None
+
+        is_speech = energy > self.threshold
+
+        if self._phrase is None:
+            if is_speech:
+                self._phrase = list(self._pre_roll) + [frame]
+                self._phrase_start = index - len(self._pre_roll)
+                self._silent_frames = 0
+                self._speech_frames = 1
+                self._pre_roll.clear()
+            else:
+                self.noise_floor += self.adapt_rate * (energy - self.noise_floor)
+                self._pre_roll.append(frame)
+            return None
+
+        self._phrase.append(frame)
+        if is_speech:
+            self._silent_frames = 0
+            self._speech_frames += 1
+        else:
+            self._silent_frames += 1
+        if self._silent_frames >= self.pause_frames or len(self._phrase) >= self.max_phrase_frames:
+            return self._end_phrase()
+        return None
+
+    def flush(self):
+        """End any phrase in progress (at end of stream)"""
+        if self._phrase is None:
+            return None
+        return self._end_phrase()
+
+    def _end_phrase(self):
+        frames = self._phrase
+        self._phrase = None
+        # Pre-roll and pauses stay in the audio but only speech frames count towards the minimum length
+        speech_frames = self._speech_frames
+        self._silent_frames = 0
+        self._speech_frames = 0
+        if speech_frames < self.min_phrase_frames:
+            return None
+        start = self._phrase_start * self.frame_duration
+        end = start + len(frames) * self.frame_duration
+        return b"".join(frames), start, end
+
+def google_recognizer(language="en-US"):
+    """Recognizer callable backed by the Google Web Speech API"""
+    recognizer = sr.Recognizer()
+
+    def recognize(audio):
+        return recognizer.recognize_google(audio, language=language)
+    return recognize
+
+class StreamingListener:
+    """Background speech capture that emits recognized phrases as they finish
+
+    Audio is read continuously from a source (microphone or WAV file) on one
+    thread and segmented with EnergyVAD; finished phrases are recognized on a
+    second thread so a slow recognizer never stalls capture. Phrases are
+    delivered through the optional on_phrase callback and can be consumed
+    with get(), iteration, or ``async for``. on_done() is called once the
+    stream has ended, whether the source ran out, capture failed or stop()
+    was called.
+
+    recognizer is any callable taking speech_recognition.AudioData and
+    returning text (default: Google Web Speech).
+    """
+
+    def __init__(self, source, recognizer=None, vad=None, on_phrase=None, on_done=None):
+        self.source = source
+        self.recognizer = recognizer or google_recognizer()
+        self.vad = vad or EnergyVAD(frame_duration=source.frame_duration)
+        self.on_phrase = on_phrase
+        self.on_done = on_done
+        self.phrases = queue.Queue()
+        self._audio = queue.Queue()
+        self._stopped = threading.Event()
+        self._done = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._capture, name="speech-capture", daemon=True),
+            threading.Thread(target=self._recognize, name="speech-recognize", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop capturing; phrases already captured are still recognized"""
+        self._stopped.set()
+        if hasattr(self.source, 'stop'):
+            self.source.stop()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get(self, timeout=None):
+        """Next phrase, or None once the stream has ended (raises queue.Empty on timeout)"""
+        return self.phrases.get(timeout=timeout)
+
+    def __iter__(self):
+        while True:
+            phrase = self.phrases.get()
+            if phrase is None:
+                return
+            yield phrase
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            phrase = await loop.run_in_executor(None, self.phrases.get)
+            if phrase is None:
+                return
+            yield phrase
+
+    def wait(self, timeout=None):
+        """Block until the source is exhausted and every phrase is recognized"""
+        return self._done.wait(timeout)
+
+    def _capture(self):
+        try:
+            for frame in self.source.frames():
+                if self._stopped.is_set():
+                    break
+                segment = self.vad.process(frame)
+                if segment:
+                    self._audio.put(segment)
+            segment = self.vad.flush()
+            if segment:
+                self._audio.put(segment)
+        except Exception as e:
+            print(f"Error capturing audio: {e}")
+        finally:
+            self._audio.put(None)
+
+    def _recognize(self):
+        while True:
+            segment = self._audio.get()
+            if segment is None:
+                break
+            audio_bytes, start, end = segment
+            audio = sr.AudioData(audio_bytes, self.source.sample_rate, SAMPLE_WIDTH)
+            try:
+                phrase = Phrase(self.recognizer(audio), start, end, None)
+            except sr.UnknownValueError:
+                phrase = Phrase(None, start, end, "Could not understand audio")
+            except sr.RequestError:
+                phrase = Phrase(None, start, end, "Could not connect to speech recognition service")
+            except Exception as e:
+                phrase = Phrase(None, start, end, str(e))
+            self.phrases.put(phrase)
+            if self.on_phrase:
+                try:
+                    self.on_phrase(phrase)
+                except Exception as e:
+                    print(f"Phrase callback error: {e}")
+        self.phrases.put(None)
+        if self.on_done:
+            try:
+                self.on_done()
+            except Exception as e:
+                print(f"Stream done callback error: {e}")
+        self._done.set()
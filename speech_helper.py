@@ -1,35 +1,354 @@
 import speech_recognition as sr
-import pyttsx3
+import itertools
+import queue
 import threading
-import time
+from utils.speech_text import split_sentences, strip_markdown
+from speech_capture import MicrophoneSource, StreamingListener
 
-class SpeechHelper:
+# Lower numbers are spoken first; utterances of equal priority keep their order
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+_PRIORITY_CLOSE = -1
+
+class Pyttsx3Backend:
+    """pyttsx3 engine, created on the TTS worker thread that uses it"""
+    
+    def __init__(self, rate=180, volume=0.9):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', rate)  # Speed of speech
+        self.engine.setProperty('volume', volume)  # Volume level (0.0 to 1.0)
+    
+    def say(self, text):
+        self.engine.say(text)
+        self.engine.runAndWait()
+    
+    def stop(self):
+        self.engine.stop()
+
+class SilentTTSBackend:
+    """Backend that produces no audio, for headless servers and tests
+    
+    Records what would have been spoken; words_per_second > 0 simulates
+    speaking time (interruptible by stop()).
+    """
+    
+    def __init__(self, words_per_second=0):
+        self.words_per_second = words_per_second
+        self.spoken = []
+        self._stopped = threading.Event()
+    
+    def say(self, text):
+        self._stopped.clear()
+        if self.words_per_second:
+            self._stopped.wait(len(text.split()) / self.words_per_second)
+        if not self._stopped.is_set():
+            self.spoken.append(text)
+    
+    def stop(self):
+        self._stopped.set()
+
+class TTSWorker:
+    """One long-lived thread that owns the TTS engine and speaks queued text
+    
+    Text is split into sentences up front so the first sentence starts
+    playing immediately and interrupt() takes effect between sentences as
+    well as (via the engine's stop()) within one. Callbacks are invoked on
+    the worker thread:
+    
+        on_start(utterance_id)
+        on_sentence(utterance_id, sentence)
+        on_done(utterance_id, interrupted)
+    
+    Callbacks given to the constructor fire for every utterance; those given
+    to speak() fire for that utterance only.
+    """
+    
+    def __init__(self, backend_factory=Pyttsx3Backend, on_start=None, on_sentence=None, on_done=None):
+        self.on_start = on_start
+        self.on_sentence = on_sentence
+        self.on_done = on_done
+        self._backend_factory = backend_factory
+        self._backend = None
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._current = None
+        self._pending = {}  # utterance_id -> sentences left to speak
+        self._callbacks = {}  # utterance_id -> per-call callbacks
+        self.idle = threading.Event()
+        self.idle.set()
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._thread.start()
+    
+    def speak(self, text, priority=PRIORITY_NORMAL, interrupt=False, on_start=None, on_sentence=None, on_done=None):
+        """Queue text for speaking and return its utterance id (None if there is nothing to say)"""
+        if interrupt:
+            self.interrupt()
+        sentences = split_sentences(strip_markdown(text))
+        if not sentences:
+            return None
+        with self._lock:
+            utterance_id = next(self._ids)
+            generation = self._generation
+            self._pending[utterance_id] = len(sentences)
+            self._callbacks[utterance_id] = {
+                'on_start': on_start, 'on_sentence': on_sentence, 'on_done': on_done
+            }
+            self.idle.clear()
+            for index, sentence in enumerate(sentences):
+                self._queue.put((priority, next(self._sequence), generation, utterance_id, index, sentence))
+        return utterance_id
+    
+    def interrupt(self):
+        """Stop the current sentence and drop everything queued"""
+        with self._lock:
+            self._generation += 1
+            flushed = list(self._pending)
+            current = self._current
+            self._pending.clear()
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if current is None:
+                self.idle.set()
+        if current is not None and self._backend is not None:
+            try:
+                self._backend.stop()
+            except Exception as e:
+                print(f"TTS Error: {e}")
+        for utterance_id in flushed:
+            if utterance_id != current:
+                self._notify('on_done', utterance_id, True)
+    
+    def cancel(self, utterance_ids):
+        """Stop and drop the given utterances, leaving other queued speech in place"""
+        with self._lock:
+            cancelled = [utterance_id for utterance_id in utterance_ids if utterance_id in self._pending]
+            for utterance_id in cancelled:
+                del self._pending[utterance_id]
+            current = self._current if self._current in cancelled else None
+            if self._current is None and not self._pending:
+                self.idle.set()
+        # Sentences still in the queue are skipped by the worker once their utterance is gone
+        if current is not None and self._backend is not None:
+            try:
+                self._backend.stop()
+            except Exception as e:
+                print(f"TTS Error: {e}")
+        for utterance_id in cancelled:
+            if utterance_id != current:
+                self._notify('on_done', utterance_id, True)
+    
+    def is_speaking(self):
+        """Check if anything is being spoken or waiting to be spoken"""
+        return not self.idle.is_set()
+    
+    def wait_until_done(self, timeout=None):
+        """Block until the queue is empty; returns False on timeout"""
+        return self.idle.wait(timeout)
+    
+    def close(self, timeout=None):
+        """Interrupt speech and stop the worker thread"""
+        self.interrupt()
+        self._queue.put((_PRIORITY_CLOSE, next(self._sequence), None, None, None, None))
+        self._thread.join(timeout)
+    
+    def _notify(self, event, utterance_id, *args):
+        """Call the worker-wide and per-utterance callbacks for event"""
+        with self._lock:
+            if event == 'on_done':
+                per_call = self._callbacks.pop(utterance_id, {})
+            else:
+                per_call = self._callbacks.get(utterance_id, {})
+        for callback in (getattr(self, event), per_call.get(event)):
+            if callback:
+                try:
+                    callback(utterance_id, *args)
+                except Exception as e:
+                    print(f"TTS callback error: {e}")
+    
+    def _run(self):
+        try:
+            self._backend = self._backend_factory()
+        except Exception as e:
+            print(f"TTS Error: {e}")
+        
+        while True:
+            priority, _, generation, utterance_id, index, sentence = self._queue.get()
+            if priority == _PRIORITY_CLOSE:
+                return
+            with self._lock:
+                if generation != self._generation or utterance_id not in self._pending:
+                    continue
+                self._current = utterance_id
+            
+            if index == 0:
+                self._notify('on_start', utterance_id)
+            self._notify('on_sentence', utterance_id, sentence)
+            try:
+                if self._backend is not None:
+                    self._backend.say(sentence)
+            except Exception as e:
+                print(f"TTS Error: {e}")
+            
+            with self._lock:
+                self._current = None
+                # Flushed by interrupt() or cancelled by cancel() while speaking
+                interrupted = generation != self._generation or utterance_id not in self._pending
+                remaining = self._pending.get(utterance_id)
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining:
+                        self._pending[utterance_id] = remaining
+                    else:
+                        del self._pending[utterance_id]
+                finished = interrupted or remaining == 0
+                if not self._pending:
+                    self.idle.set()
+            if finished:
+                self._notify('on_done', utterance_id, interrupted)
+
+class _ResourcePool:
+    """Reference-counted devices and workers shared by SpeechHelper instances
+    
+    Each resource is created by its factory on first acquire and closed (if
+    a close function was given) when the last helper releases it.
+    """
+    
     def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.tts_engine = pyttsx3.init()
+        self._lock = threading.Lock()
+        self._resources = {}  # key -> [resource, refcount, close]
+    
+    def acquire(self, key, factory, close=None):
+        with self._lock:
+            entry = self._resources.get(key)
+            if entry is None:
+                entry = self._resources[key] = [factory(), 0, close]
+            entry[1] += 1
+            return entry[0]
+    
+    def release(self, key):
+        with self._lock:
+            entry = self._resources.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._resources[key]
+        resource, _, close = entry
+        if close:
+            close(resource)
+
+_pool = _ResourcePool()
+# The microphone can only be opened by one capture at a time, one-shot or streaming;
+# a plain Lock because a stream releases it on its recognition thread
+_microphone_lock = threading.Lock()
+
+_RECOGNIZER = ("recognizer",)
+_MICROPHONE = ("microphone",)
+
+def _close_tts_worker(worker):
+    worker.close(timeout=1)
+
+class SpeechHelper:
+    """Voice input and output for one user of the app
+    
+    The recognizer, microphone and TTS worker are pooled resources acquired
+    on first use, so capture-only or speak-only callers never touch the
+    other device, and every helper shares one of each (one TTS worker per
+    backend factory). Each helper only stops its own utterances; speech
+    queued by other helpers keeps playing in order. Call close(), or use the
+    helper as a context manager, to release the shared resources.
+    """
+    
+    def __init__(self, tts_backend_factory=Pyttsx3Backend):
+        self.tts_backend_factory = tts_backend_factory
+        self._recognizer = None
+        self._microphone = None
+        self._tts = None
+        self._lock = threading.Lock()
+        # Utterances this helper queued that have not finished yet
+        self._utterances = set()
+        self._speech_lock = threading.RLock()
+        self._speech_done = threading.Event()
+        self._speech_done.set()
         self.is_listening = False
-        self.is_speaking = False
-        self.speech_thread = None
-        
-        # Configure TTS engine
-        self.tts_engine.setProperty('rate', 180)  # Speed of speech
-        self.tts_engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
+        self.streaming_listener = None
+        # Ambient noise is measured once; dynamic_energy_threshold keeps adapting afterwards
+        self._calibrated = False
+    
+    @property
+    def recognizer(self):
+        with self._lock:
+            if self._recognizer is None:
+                self._recognizer = _pool.acquire(_RECOGNIZER, sr.Recognizer)
+            return self._recognizer
+    
+    @property
+    def microphone(self):
+        with self._lock:
+            if self._microphone is None:
+                self._microphone = _pool.acquire(_MICROPHONE, sr.Microphone)
+            return self._microphone
+    
+    @property
+    def tts(self):
+        with self._lock:
+            if self._tts is None:
+                self._tts = _pool.acquire(("tts", self.tts_backend_factory), lambda: TTSWorker(self.tts_backend_factory),
+                                          _close_tts_worker)
+            return self._tts
+    
+    def close(self):
+        """Stop capture and speech, and release the shared resources"""
+        self.stop_streaming()
+        self.stop_speaking()
+        with self._lock:
+            held = [
+                (self._recognizer, _RECOGNIZER),
+                (self._microphone, _MICROPHONE),
+                (self._tts, ("tts", self.tts_backend_factory)),
+            ]
+            self._recognizer = self._microphone = self._tts = None
+        for resource, key in held:
+            if resource is not None:
+                _pool.release(key)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
         
     def start_listening(self):
         """Start listening for voice input"""
+        if self.streaming_listener is not None and not self.streaming_listener.wait(0):
+            return "Error: Streaming capture is already using the microphone"
         if self.is_listening:
             return None
+        if not _microphone_lock.acquire(blocking=False):
+            return "Error: Microphone is in use"
             
         self.is_listening = True
         try:
-            with self.microphone as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
-            # Listen for audio
-            with self.microphone as source:
-                audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=30)
+            try:
+                with self.microphone as source:
+                    # Adjust for ambient noise on first use only
+                    if not self._calibrated:
+                        self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                        self._calibrated = True
+                    
+                    # Listen for audio
+                    audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=30)
+            finally:
+                _microphone_lock.release()
                 
             # Convert audio to text
             text = self.recognizer.recognize_google(audio)
@@ -52,34 +371,106 @@ class SpeechHelper:
     def stop_listening(self):
         """Stop listening"""
         self.is_listening = False
+        self.stop_streaming()
     
-    def start_speaking(self, text):
-        """Start speaking text in a separate thread"""
-        if self.is_speaking:
-            self.stop_speaking()
-            
-        self.is_speaking = True
+    def start_streaming(self, on_phrase=None, source=None, recognizer=None):
+        """
+        Start continuous background capture
         
-        def speak():
-            try:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-                self.is_speaking = False
-            except Exception as e:
-                print(f"TTS Error: {e}")
-                self.is_speaking = False
+        Phrases are segmented by voice activity and recognized as they finish.
+        Consume them via on_phrase(phrase), or iterate the returned
+        StreamingListener (also supports ``async for``).
+        
+        Args:
+            on_phrase (callable): Called with each speech_capture.Phrase
+            source: Audio source (default: the microphone); e.g. a WavFileSource
+            recognizer (callable): AudioData -> text (default: Google Web Speech)
+        
+        Returns:
+            StreamingListener
+        
+        Raises:
+            RuntimeError: The microphone is already in use by another capture
+        """
+        self.stop_streaming()
         
-        self.speech_thread = threading.Thread(target=speak, daemon=True)
-        self.speech_thread.start()
+        # A microphone stream holds the shared device lock until the stream ends
+        uses_microphone = source is None
+        if uses_microphone and not _microphone_lock.acquire(blocking=False):
+            raise RuntimeError("Microphone is in use")
+        
+        def finished():
+            if uses_microphone:
+                _microphone_lock.release()
+            # The stream can end on its own (end of a WAV file, capture error)
+            if self.streaming_listener is listener:
+                self.is_listening = False
+        
+        try:
+            listener = StreamingListener(
+                source or MicrophoneSource(),
+                recognizer=recognizer,
+                on_phrase=on_phrase,
+                on_done=finished
+            )
+        except Exception:
+            if uses_microphone:
+                _microphone_lock.release()
+            raise
+        self.streaming_listener = listener
+        self.is_listening = True
+        return listener.start()
+    
+    def stop_streaming(self):
+        """Stop continuous capture started with start_streaming"""
+        if self.streaming_listener:
+            self.streaming_listener.stop()
+            self.streaming_listener = None
+            self.is_listening = False
+    
+    def start_speaking(self, text, on_start=None, on_sentence=None, on_done=None):
+        """
+        Start speaking text, replacing this helper's earlier speech
+        
+        Callbacks run on the TTS worker thread for this utterance only:
+        on_start(utterance_id), on_sentence(utterance_id, sentence) and
+        on_done(utterance_id, interrupted).
+        
+        Returns:
+            int: Utterance id, or None if the text has nothing to speak
+        """
+        def done(utterance_id, interrupted):
+            with self._speech_lock:
+                self._utterances.discard(utterance_id)
+                if not self._utterances:
+                    self._speech_done.set()
+            if on_done:
+                on_done(utterance_id, interrupted)
+        
+        tts = self.tts
+        # Held while queueing so done() cannot run before the id is recorded
+        with self._speech_lock:
+            self.stop_speaking()
+            utterance_id = tts.speak(text, on_start=on_start, on_sentence=on_sentence, on_done=done)
+            if utterance_id is not None:
+                self._utterances.add(utterance_id)
+                self._speech_done.clear()
+        return utterance_id
     
     def stop_speaking(self):
-        """Stop speaking"""
-        if self.is_speaking:
-            try:
-                self.tts_engine.stop()
-                self.is_speaking = False
-            except:
-                pass
+        """Stop this helper's speech and discard its queued text"""
+        with self._speech_lock:
+            utterance_ids = list(self._utterances)
+        if utterance_ids and self._tts is not None:
+            self._tts.cancel(utterance_ids)
+    
+    def wait_until_done(self, timeout=None):
+        """Block until this helper's speech has finished; returns False on timeout"""
+        return self._speech_done.wait(timeout)
+    
+    @property
+    def is_speaking(self):
+        return not self._speech_done.is_set()
     
     def is_currently_listening(self):
         """Check if currently listening"""
@@ -0,0 +1,88 @@
+"""WAV-driven tests for the streaming speech capture pipeline."""
+import threading
+import wave
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("speech_recognition")
+
+from speech_capture import EnergyVAD, StreamingListener, WavFileSource
+
+SAMPLE_RATE = 16000
+
+
+def write_wav(path, segments):
+    """Write (seconds, amplitude) segments as a 16-bit mono WAV: low noise, or a tone when amplitude > 0"""
+    rng = np.random.default_rng(0)
+    chunks = []
+    for seconds, amplitude in segments:
+        count = int(seconds * SAMPLE_RATE)
+        if amplitude:
+            t = np.arange(count) / SAMPLE_RATE
+            chunks.append(amplitude * np.sin(2 * np.pi * 440 * t))
+        else:
+            chunks.append(rng.normal(0, 20, count))
+    samples = np.concatenate(chunks).astype(np.int16)
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return str(path)
+
+
+def run_listener(path):
+    done = threading.Event()
+    calls = []
+
+    def on_done():
+        calls.append(True)
+        done.set()
+
+    listener = StreamingListener(
+        WavFileSource(path),
+        recognizer=lambda audio: f"{len(audio.frame_data)} bytes",
+        on_done=on_done,
+    ).start()
+    assert listener.wait(10)
+    return list(listener), calls, done
+
+
+def test_phrase_boundaries(tmp_path):
+    path = write_wav(tmp_path / "two_phrases.wav", [
+        (1.0, 0), (1.0, 8000), (1.5, 0), (0.6, 8000), (1.5, 0),
+    ])
+    phrases, _, _ = run_listener(path)
+
+    assert len(phrases) == 2
+    first, second = phrases
+    assert all(phrase.text and phrase.error is None for phrase in phrases)
+    # Phrases start up to the pre-roll before the tone and end after the trailing pause
+    assert 0.65 <= first.start <= 1.0
+    assert 2.0 <= first.end <= 3.0
+    assert 3.15 <= second.start <= 3.5
+    assert 4.1 <= second.end <= 5.0
+
+
+def test_short_burst_is_rejected(tmp_path):
+    path = write_wav(tmp_path / "click.wav", [(1.2, 0), (0.03, 8000), (1.2, 0)])
+    phrases, _, _ = run_listener(path)
+    assert phrases == []
+
+
+def test_short_burst_is_rejected_by_vad():
+    vad = EnergyVAD()
+    frame_samples = int(SAMPLE_RATE * vad.frame_duration)
+    silence = np.zeros(frame_samples, dtype=np.int16).tobytes()
+    click = np.full(frame_samples, 8000, dtype=np.int16).tobytes()
+    frames = [silence] * 40 + [click] + [silence] * 40
+    assert [vad.process(frame) for frame in frames] == [None] * len(frames)
+    assert vad.flush() is None
+
+
+def test_on_done_called_once_at_end_of_file(tmp_path):
+    path = write_wav(tmp_path / "phrase.wav", [(0.6, 0), (0.8, 8000), (1.0, 0)])
+    phrases, calls, done = run_listener(path)
+    assert len(phrases) == 1
+    assert done.is_set()
+    assert calls == [True]
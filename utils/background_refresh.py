@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundRefresher:
+    """Runs cache regenerations on a background worker.
+
+    Refreshes are deduplicated by key (a key already queued or running is not
+    scheduled again) and rate-limited to ``max_per_minute`` schedules in any
+    sliding 60 second window. Requests over the limit are dropped; the stale
+    entry is simply served again and retried on a later hit.
+    """
+
+    def __init__(self, max_workers=1, max_per_minute=6, name="qa-refresh"):
+        self.max_per_minute = max_per_minute
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future
+        self._recent = deque()
+
+    def _allow(self, now):
+        while self._recent and now - self._recent[0] >= 60:
+            self._recent.popleft()
+        return len(self._recent) < self.max_per_minute
+
+    def schedule(self, key, func, *args):
+        """Schedule func(*args) unless key is in flight or the rate limit is hit
+
+        Returns the Future of the scheduled work, or None if it was dropped.
+        """
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Error refreshing cached entry: {e}")
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+
+        with self._lock:
+            now = time.monotonic()
+            if key in self._in_flight or not self._allow(now):
+                return None
+            self._recent.append(now)
+            # Submitted under the lock so run() cannot clear the key before it is recorded
+            future = self._in_flight[key] = self._executor.submit(run)
+        return future
+
+    def pending(self, key):
+        """Future of the queued or running refresh for key, or None"""
+        with self._lock:
+            return self._in_flight.get(key)
+
+    def is_refreshing(self, key):
+        """Check if a refresh for key is queued or running"""
+        return self.pending(key) is not None
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,67 @@
+import hashlib
+import re
+import numpy as np
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+HASHING_BACKEND = 'hashing'
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#.]+")
+
+
+class HashingEmbeddings:
+    """Deterministic bag-of-words embeddings that need no model download.
+
+    Used as a local stand-in for SentenceTransformer in offline replays and
+    benchmarks. Unigrams and bigrams are hashed into a fixed number of signed
+    buckets and the result is L2-normalised, so cosine similarity behaves the
+    same way as with the real model (1.0 for identical text).
+    """
+
+    def __init__(self, dimensions=384):
+        self.dimensions = dimensions
+
+    def _bucket(self, token):
+        digest = hashlib.md5(token.encode()).digest()
+        index = int.from_bytes(digest[:4], 'little') % self.dimensions
+        sign = 1.0 if digest[4] & 1 else -1.0
+        return index, sign
+
+    def _embed(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def encode(self, texts):
+        """Encode a list of texts, mirroring SentenceTransformer.encode"""
+        return np.array([self._embed(text) for text in texts])
+
+    def embed_documents(self, texts):
+        """LangChain Embeddings interface"""
+        return [vector.tolist() for vector in self.encode(texts)]
+
+    def embed_query(self, text):
+        """LangChain Embeddings interface"""
+        return self._embed(text).tolist()
+
+
+def load_embedding_model(name=None):
+    """Load an embedding model by name.
+
+    ``hashing`` (optionally ``hashing:<dimensions>``) selects the offline
+    HashingEmbeddings stand-in; anything else is treated as a
+    sentence-transformers model name.
+    """
+    name = name or DEFAULT_MODEL_NAME
+    if name == HASHING_BACKEND or name.startswith(HASHING_BACKEND + ':'):
+        _, _, dimensions = name.partition(':')
+        return HashingEmbeddings(int(dimensions) if dimensions else 384)
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_DB_FILE = os.path.join(os.path.dirname(__file__), "..", "qa_history.db")
+LEGACY_JSON_FILE = os.path.join(os.path.dirname(__file__), "..", "qa_history.json")
+
+SCHEMA_VERSION = 2
+
+# Sidebar listings never touch the (large) contents table
+SUMMARY_COLUMNS = "id, timestamp, job_role, interview_level, title, content_hash"
+
+
+def content_hash(text):
+    """Key of a result in the deduplicated contents table"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class HistoryStore:
+    """SQLite-backed session history.
+
+    Appends are a single INSERT and listings are indexed, paginated queries,
+    so neither depends on how much history has accumulated. An existing
+    qa_history.json is imported once when the database is first created.
+
+    Result markdown lives in a separate contents table keyed by its SHA-256,
+    so repeated cache hits for the same Q&A share one copy; history rows only
+    hold the hash and the text is read when an entry is loaded.
+    """
+
+    def __init__(self, db_path=None, legacy_json_path=LEGACY_JSON_FILE):
+        self.db_path = db_path or DEFAULT_DB_FILE
+        self._lock = threading.Lock()
+        # One connection shared by Streamlit's session threads, serialised by the lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._init_schema(legacy_json_path)
+
+    def _init_schema(self, legacy_json_path):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS contents (
+                    hash TEXT PRIMARY KEY,
+                    body TEXT NOT NULL
+                )
+            """)
+            if version == 1:
+                self._migrate_inline_results()
+            else:
+                self._create_history_table()
+                self._import_legacy_json(legacy_json_path)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_history_table(self, name="history"):
+        self._conn.execute(f"""
+            CREATE TABLE {name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                job_role TEXT NOT NULL,
+                interview_level TEXT,
+                title TEXT,
+                content_hash TEXT REFERENCES contents(hash)
+            )
+        """)
+
+    def _migrate_inline_results(self):
+        """Version 1 stored the full result in every history row; move it to contents"""
+        self._conn.create_function("content_hash", 1, content_hash, deterministic=True)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO contents (hash, body) "
+            "SELECT content_hash(result), result FROM history WHERE result IS NOT NULL"
+        )
+        self._create_history_table("history_v2")
+        self._conn.execute(
+            "INSERT INTO history_v2 (id, timestamp, job_role, interview_level, title, content_hash) "
+            "SELECT id, timestamp, job_role, interview_level, title, "
+            "CASE WHEN result IS NULL THEN NULL ELSE content_hash(result) END FROM history"
+        )
+        self._conn.execute("DROP TABLE history")
+        self._conn.execute("ALTER TABLE history_v2 RENAME TO history")
+
+    def _store_content(self, text):
+        """Insert text into contents if new and return its hash"""
+        key = content_hash(text)
+        self._conn.execute("INSERT OR IGNORE INTO contents (hash, body) VALUES (?, ?)", (key, text))
+        return key
+
+    def _import_legacy_json(self, path):
+        """Import entries from the old qa_history.json (stored newest first)"""
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"Error importing legacy history file: {e}")
+            return
+        if not isinstance(entries, list):
+            print("Error importing legacy history file: expected a list of entries")
+            return
+
+        rows = []
+        skipped = 0
+        for entry in reversed(entries):
+            if not isinstance(entry, dict) or not isinstance(entry.get('job_role'), str):
+                skipped += 1
+                continue
+            # Older history files stored the markdown under "content"
+            result = entry.get('result', entry.get('content'))
+            rows.append((
+                entry.get('timestamp') or '',
+                entry['job_role'],
+                entry.get('interview_level'),
+                entry.get('title') or entry['job_role'][:50].strip(),
+                self._store_content(result) if isinstance(result, str) else None,
+            ))
+        if skipped:
+            print(f"Skipped {skipped} malformed legacy history entries")
+        self._conn.executemany(
+            "INSERT INTO history (timestamp, job_role, interview_level, title, content_hash) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def add_entry(self, job_role, interview_level, title, result, timestamp=None):
+        """Append a history entry and return its id"""
+        timestamp = timestamp or datetime.now().isoformat()
+        with self._lock, self._conn:
+            key = self._store_content(result)
+            cursor = self._conn.execute(
+                "INSERT INTO history (timestamp, job_role, interview_level, title, content_hash) VALUES (?, ?, ?, ?, ?)",
+                (timestamp, job_role, interview_level, title, key)
+            )
+            return cursor.lastrowid
+
+    def list_entries(self, limit=10, offset=0, before_id=None):
+        """Return newest-first entry summaries (without result).
+
+        Use before_id (the last id of the previous page) for deep pagination;
+        offset is convenient for the first few pages of the sidebar.
+        """
+        query = f"SELECT {SUMMARY_COLUMNS} FROM history"
+        params = []
+        if before_id is not None:
+            query += " WHERE id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_entry(self, entry_id):
+        """Return a full entry including result, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT h.id, h.timestamp, h.job_role, h.interview_level, h.title, h.content_hash, "
+                "c.body AS result FROM history h LEFT JOIN contents c ON c.hash = h.content_hash "
+                "WHERE h.id = ?", (entry_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_content(self, key):
+        """Return the result text stored under a content hash, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM contents WHERE hash = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def has_entries(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM history LIMIT 1").fetchone() is not None
+
+    def clear(self):
+        """Delete all history entries"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM history")
+            self._conn.execute("DELETE FROM contents")
+
+    def close(self):
+        self._conn.close()
@@ -1,15 +1,26 @@
 import os
 import hashlib
-import streamlit as st
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-from langchain.schema.runnable import RunnableSequence
-from .simple_vector_store import SimpleVectorStore
+import threading
+from datetime import datetime
+from .store_base import create_vector_store, DEFAULT_BACKEND, DEFAULT_SIMILARITY_THRESHOLD
+from .background_refresh import BackgroundRefresher
+
+INTERVIEW_LEVELS = ("entry", "mid", "senior")
+
+# Heavy dependencies (streamlit, langchain, sentence-transformers, sklearn) are
+# imported on first use; utils.warmup can load them in the background instead.
+
+# Shared across Streamlit sessions so the model and data are loaded once per process
+_vector_store = None
+_vector_store_lock = threading.Lock()
+_refresher = None
+_prefetcher = None
 
 def get_gemini_api_key():
     """Get Gemini API key from environment or Streamlit secrets"""
     # Try to get from Streamlit secrets first (for cloud deployment)
     try:
+        import streamlit as st
         return st.secrets["GOOGLE_API_KEY"]
     except:
         # Fallback to environment variable (for local development)
@@ -17,89 +28,280 @@ def get_gemini_api_key():
         load_dotenv()
         return os.getenv("GOOGLE_API_KEY")
 
-def generate_or_retrieve_qa(job_description, interview_level="entry"):
+def get_similarity_threshold():
+    """Get the cache similarity threshold from Streamlit secrets or environment"""
+    try:
+        import streamlit as st
+        return float(st.secrets["SIMILARITY_THRESHOLD"])
+    except:
+        value = os.getenv("SIMILARITY_THRESHOLD")
+        return float(value) if value else DEFAULT_SIMILARITY_THRESHOLD
+
+def _generate_qa_content(job_description, interview_level, api_key):
+    """Generate Q&A markdown with Gemini"""
+    # Imported on first generation so importing this module stays cheap
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain.prompts import PromptTemplate
+
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-1.5-flash",
+        temperature=0.7,
+        google_api_key=api_key
+    )
+
+    prompt_template = PromptTemplate(
+        input_variables=["job_description", "interview_level"],
+        template="""
+        Create comprehensive interview questions and answers for the following job:
+
+        Job Description: {job_description}
+        Interview Level: {interview_level}
+
+        Generate 8-10 relevant questions with detailed answers covering:
+        1. Technical skills and knowledge
+        2. Problem-solving scenarios
+        3. Behavioral questions
+        4. Role-specific challenges
+
+        Format the response in markdown with clear sections:
+
+        ## Technical Questions
+
+        **Q1: [Technical Question]**
+        A: [Detailed Answer]
+
+        ## Problem-Solving Questions
+
+        **Q2: [Problem-Solving Question]**
+        A: [Detailed Answer]
+
+        ## Behavioral Questions
+
+        **Q3: [Behavioral Question]**
+        A: [Detailed Answer]
+
+        Continue this format for all questions.
+        """
+    )
+
+    # Use the new RunnableSequence approach
+    chain = prompt_template | llm
+    result = chain.invoke({
+        "job_description": job_description,
+        "interview_level": interview_level
+    })
+
+    return result.content
+
+def get_refresh_after_seconds():
+    """Get the age (seconds) after which cache hits are refreshed in the background.
+
+    Returns None when stale-while-revalidate is disabled (the default).
+    """
+    try:
+        import streamlit as st
+        value = st.secrets["CACHE_REFRESH_AFTER_SECONDS"]
+    except:
+        value = os.getenv("CACHE_REFRESH_AFTER_SECONDS")
+    return float(value) if value else None
+
+def get_prefetch_sibling_levels():
+    """Whether a cache miss also generates the other interview levels in the background"""
+    try:
+        import streamlit as st
+        value = st.secrets["PREFETCH_SIBLING_LEVELS"]
+    except:
+        value = os.getenv("PREFETCH_SIBLING_LEVELS", "")
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+def get_vector_store_backend():
+    """Get the vector store backend ("simple" or "chroma") from secrets or environment"""
+    try:
+        import streamlit as st
+        return st.secrets["VECTOR_STORE_BACKEND"]
+    except:
+        return os.getenv("VECTOR_STORE_BACKEND", DEFAULT_BACKEND)
+
+def get_vector_store():
+    """Return the process-wide vector store, loading it on first use"""
+    global _vector_store
+    with _vector_store_lock:
+        if _vector_store is None:
+            _vector_store = create_vector_store(get_vector_store_backend())
+        return _vector_store
+
+def set_vector_store(store):
+    """Replace the process-wide vector store (benchmarks, tools, embedding the generator)"""
+    global _vector_store
+    with _vector_store_lock:
+        _vector_store = store
+
+def get_refresher():
+    """Return the process-wide background refresher"""
+    global _refresher
+    with _vector_store_lock:
+        if _refresher is None:
+            _refresher = BackgroundRefresher()
+        return _refresher
+
+def get_prefetcher():
+    """Return the process-wide sibling-level prefetcher
+    
+    Separate from get_refresher() so prefetches cannot use up the
+    stale-while-revalidate rate limit; two workers let both sibling levels
+    generate at once.
+    """
+    global _prefetcher
+    with _vector_store_lock:
+        if _prefetcher is None:
+            _prefetcher = BackgroundRefresher(max_workers=2, max_per_minute=12, name="qa-prefetch")
+        return _prefetcher
+
+def _is_stale(document, max_age_seconds):
+    try:
+        timestamp = datetime.fromisoformat(document['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return (datetime.now() - timestamp).total_seconds() > max_age_seconds
+
+def gemini_generator(api_key):
+    """Return a generate(job_description, interview_level) callable backed by Gemini"""
+    def generate(job_description, interview_level):
+        return _generate_qa_content(job_description, interview_level, api_key)
+    return generate
+
+def _refresh_entry(job_description, interview_level, generate, doc_id=None):
+    """Regenerate a cached entry and replace it in the store
+    
+    doc_id is the stored entry's id; older Chroma entries hold a truncated
+    job description, so an id rebuilt from it would insert a new document.
+    """
+    qa_content = generate(job_description, interview_level)
+    get_vector_store().add_document(job_description, qa_content, interview_level, doc_id)
+
+def _prefetch_level(job_description, interview_level, generate):
+    """Generate and store one level unless a similar entry already exists"""
+    if lookup_qa(job_description, interview_level):
+        return
+    _refresh_entry(job_description, interview_level, generate)
+
+def prefetch_sibling_levels(job_description, interview_level, generate):
+    """
+    Speculatively generate the other interview levels for a job description
+    
+    Each level is stored under its own doc_id, so switching level later is a
+    cache hit. Runs on the prefetcher, which deduplicates by doc_id and
+    rate-limits LLM calls.
+    """
+    vector_store = get_vector_store()
+    prefetcher = get_prefetcher()
+    for level in INTERVIEW_LEVELS:
+        if level != interview_level:
+            prefetcher.schedule(
+                vector_store._generate_doc_id(job_description, level),
+                _prefetch_level, job_description, level, generate
+            )
+
+def make_title(job_description):
+    """Create a title from job description"""
+    return job_description[:50].strip() + ("..." if len(job_description) > 50 else "")
+
+def lookup_qa(job_description, interview_level="entry"):
+    """
+    Look up cached Q&A without generating
+    
+    Returns:
+        tuple: (document, similarity), or None on a cache miss
+    """
+    return get_vector_store().find_similar(
+        job_description, interview_level, get_similarity_threshold()
+    )
+
+def _default_generator(generate):
+    """Return generate, or a Gemini generator when it is None"""
+    if generate is not None:
+        return generate
+    # Get API key
+    api_key = get_gemini_api_key()
+    if not api_key:
+        raise Exception("Gemini API key not found. Please set GOOGLE_API_KEY in secrets.")
+    return gemini_generator(api_key)
+
+def _serve_cached(document, generate):
+    """Return a cache hit's content, scheduling a refresh if it is stale"""
+    # Stale-while-revalidate: serve the cached entry now, refresh it in the background
+    max_age = get_refresh_after_seconds()
+    if max_age is not None and _is_stale(document, max_age):
+        get_refresher().schedule(
+            document['doc_id'], _refresh_entry,
+            document['job_description'], document['interview_level'], _default_generator(generate),
+            document['doc_id']
+        )
+    return document['qa_content']
+
+def retrieve_qa(job_description, interview_level="entry", generate=None):
+    """
+    Serve Q&A from the cache only, never calling the LLM in the foreground
+    
+    Args:
+        generate (callable): Used if a stale hit is refreshed in the background
+    
+    Returns:
+        tuple: (qa_content, True, title), or None on a cache miss
+    """
+    try:
+        match = lookup_qa(job_description, interview_level)
+        if not match:
+            return None
+        return _serve_cached(match[0], generate), True, make_title(job_description)
+    except Exception as e:
+        raise Exception(f"Error retrieving Q&A: {str(e)}")
+
+def generate_or_retrieve_qa(job_description, interview_level="entry", generate=None):
     """
     Generate or retrieve Q&A for interview preparation
     
     Args:
         job_description (str): Job description or role
         interview_level (str): entry, mid, or senior
+        generate (callable): generate(job_description, interview_level) -> markdown;
+            defaults to Gemini (pass a fake for local load testing)
     
     Returns:
         tuple: (qa_content, from_cache, title)
     """
     try:
-        # Get API key
-        api_key = get_gemini_api_key()
-        if not api_key:
-            raise Exception("Gemini API key not found. Please set GOOGLE_API_KEY in secrets.")
+        generate = _default_generator(generate)
         
-        # Initialize simple vector store
-        vector_store = SimpleVectorStore()
+        # Shared vector store (backend chosen by VECTOR_STORE_BACKEND)
+        vector_store = get_vector_store()
         
-        # Create a title from job description
-        title = job_description[:50].strip() + ("..." if len(job_description) > 50 else "")
+        title = make_title(job_description)
         
         # Try to retrieve from vector store first
-        cached_result = vector_store.search_similar(job_description, interview_level)
+        match = lookup_qa(job_description, interview_level)
         
-        if cached_result:
-            return cached_result, True, title
+        if match:
+            return _serve_cached(match[0], generate), True, title
         
-        # Generate new Q&A using Gemini
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash",
-            temperature=0.7,
-            google_api_key=api_key
-        )
+        # A prefetch for this exact level may already be generating it; wait rather than duplicate it
+        pending = get_prefetcher().pending(vector_store._generate_doc_id(job_description, interview_level))
+        if pending is not None:
+            pending.result()
+            match = lookup_qa(job_description, interview_level)
+            if match:
+                return _serve_cached(match[0], generate), True, title
         
-        prompt_template = PromptTemplate(
-            input_variables=["job_description", "interview_level"],
-            template="""
-            Create comprehensive interview questions and answers for the following job:
-            
-            Job Description: {job_description}
-            Interview Level: {interview_level}
-            
-            Generate 8-10 relevant questions with detailed answers covering:
-            1. Technical skills and knowledge
-            2. Problem-solving scenarios
-            3. Behavioral questions
-            4. Role-specific challenges
-            
-            Format the response in markdown with clear sections:
-            
-            ## Technical Questions
-            
-            **Q1: [Technical Question]**
-            A: [Detailed Answer]
-            
-            ## Problem-Solving Questions
-            
-            **Q2: [Problem-Solving Question]**
-            A: [Detailed Answer]
-            
-            ## Behavioral Questions
-            
-            **Q3: [Behavioral Question]**
-            A: [Detailed Answer]
-            
-            Continue this format for all questions.
-            """
-        )
-        
-        # Use the new RunnableSequence approach
-        chain = prompt_template | llm
-        result = chain.invoke({
-            "job_description": job_description,
-            "interview_level": interview_level
-        })
-        
-        qa_content = result.content
+        # Generate new Q&A (Gemini unless a generator was passed in)
+        qa_content = generate(job_description, interview_level)
         
         # Store in vector database for future use
         vector_store.add_document(job_description, qa_content, interview_level)
         
+        # Users often try the other levels next; have them ready as cache hits
+        if get_prefetch_sibling_levels():
+            prefetch_sibling_levels(job_description, interview_level, generate)
+        
         return qa_content, False, title
         
     except Exception as e:
@@ -1,17 +1,29 @@
 import os
-import hashlib
 import json
 import pickle
+import threading
 from datetime import datetime
-from sentence_transformers import SentenceTransformer
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from .embeddings import load_embedding_model
+from .store_base import BaseVectorStore, DEFAULT_SIMILARITY_THRESHOLD, DEFAULT_PAGE_SIZE, to_datetime
 
-class SimpleVectorStore:
-    def __init__(self):
-        self.data_file = os.path.join(os.path.dirname(__file__), "..", "vector_data.json")
-        self.embeddings_file = os.path.join(os.path.dirname(__file__), "..", "embeddings.pkl")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+class SimpleVectorStore(BaseVectorStore):
+    def __init__(self, data_dir=None, model=None, persist=True):
+        """
+        Args:
+            data_dir (str): Directory holding vector_data.json and embeddings.pkl
+            model: Embedding model name, or an object with an ``encode`` method
+            persist (bool): Write changes back to data_dir (disable for replays)
+        """
+        data_dir = data_dir or DEFAULT_DATA_DIR
+        self.data_file = os.path.join(data_dir, "vector_data.json")
+        self.embeddings_file = os.path.join(data_dir, "embeddings.pkl")
+        self.persist = persist
+        # Guards documents/embeddings against concurrent background refreshes
+        self._lock = threading.RLock()
+        self.model = model if hasattr(model, 'encode') else load_embedding_model(model)
         self.load_data()
     
     def load_data(self):
@@ -32,46 +44,40 @@ class SimpleVectorStore:
             print(f"Error loading data: {e}")
             self.documents = []
             self.embeddings = []
+        self._assign_sequence()
+    
+    def _assign_sequence(self):
+        """Give every document an increasing 'seq' (its insertion order) for stable cursors"""
+        sequence = [doc.get('seq') for doc in self.documents]
+        if any(not isinstance(seq, int) for seq in sequence) or sequence != sorted(set(sequence)):
+            # Documents saved before seq existed, or assigned directly: number them in list order
+            for i, doc in enumerate(self.documents):
+                doc['seq'] = i + 1
+        self._next_seq = self.documents[-1]['seq'] + 1 if self.documents else 1
     
     def save_data(self):
         """Save data and embeddings to files"""
+        if not self.persist:
+            return
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.documents, f, indent=2, ensure_ascii=False)
-            
-            with open(self.embeddings_file, 'wb') as f:
-                pickle.dump(self.embeddings, f)
+            # Write to temp files and rename so readers never see a partial file
+            with self._lock:
+                with open(self.data_file + ".tmp", 'w', encoding='utf-8') as f:
+                    json.dump(self.documents, f, indent=2, ensure_ascii=False)
+                
+                with open(self.embeddings_file + ".tmp", 'wb') as f:
+                    pickle.dump(self.embeddings, f)
+                
+                os.replace(self.data_file + ".tmp", self.data_file)
+                os.replace(self.embeddings_file + ".tmp", self.embeddings_file)
         except Exception as e:
             print(f"Error saving data: {e}")
     
-    def _generate_doc_id(self, job_description, interview_level):
-        """Generate a unique document ID"""
-        content = f"{job_description.strip().lower()}_{interview_level}"
-        return hashlib.md5(content.encode()).hexdigest()
-    
-    def add_document(self, job_description, qa_content, interview_level):
-        """Add a document to the vector store"""
+    def add_document(self, job_description, qa_content, interview_level, doc_id=None):
+        """Add a document to the vector store (replacing doc_id if given)"""
         try:
-            doc_id = self._generate_doc_id(job_description, interview_level)
+            doc_id = doc_id or self._generate_doc_id(job_description, interview_level)
             
-            # Check if document already exists
-            for i, doc in enumerate(self.documents):
-                if doc.get('doc_id') == doc_id:
-                    # Update existing document
-                    self.documents[i] = {
-                        'doc_id': doc_id,
-                        'job_description': job_description,
-                        'qa_content': qa_content,
-                        'interview_level': interview_level,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    # Update embedding
-                    embedding = self.model.encode([job_description])
-                    self.embeddings[i] = embedding[0]
-                    self.save_data()
-                    return True
-            
-            # Add new document
             document = {
                 'doc_id': doc_id,
                 'job_description': job_description,
@@ -80,20 +86,93 @@ class SimpleVectorStore:
                 'timestamp': datetime.now().isoformat()
             }
             
-            # Generate embedding
+            # Generate embedding outside the lock; encoding is the slow part
             embedding = self.model.encode([job_description])
             
-            self.documents.append(document)
-            self.embeddings.append(embedding[0])
-            
-            self.save_data()
+            with self._lock:
+                # Check if document already exists
+                for i, doc in enumerate(self.documents):
+                    if doc.get('doc_id') == doc_id:
+                        # Replace existing document and its embedding together, keeping its place
+                        document['seq'] = doc['seq']
+                        self.documents[i] = document
+                        self.embeddings[i] = embedding[0]
+                        self.save_data()
+                        return True
+                
+                # Add new document
+                document['seq'] = self._next_seq
+                self._next_seq += 1
+                self.documents.append(document)
+                self.embeddings.append(embedding[0])
+                
+                self.save_data()
             return True
         except Exception as e:
             print(f"Error adding document: {e}")
             return False
     
-    def search_similar(self, job_description, interview_level, similarity_threshold=0.8):
-        """Search for similar documents"""
+    def _index_after(self, seq):
+        """Index of the first document with a seq greater than seq (documents are in seq order)"""
+        low, high = 0, len(self.documents)
+        while low < high:
+            middle = (low + high) // 2
+            if self.documents[middle]['seq'] <= seq:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def list_documents(self, cursor=None, page_size=DEFAULT_PAGE_SIZE, interview_level=None, since=None, until=None):
+        """Return (documents, next_cursor) for one page
+
+        The cursor is the seq of the last document returned, so documents
+        deleted or added between pages never shift the walk.
+        """
+        since, until = to_datetime(since), to_datetime(until)
+        page = []
+        with self._lock:
+            index = self._index_after(cursor) if cursor else 0
+            while index < len(self.documents) and len(page) < page_size:
+                doc = self.documents[index]
+                index += 1
+                if interview_level and doc.get('interview_level') != interview_level:
+                    continue
+                if since or until:
+                    timestamp = to_datetime(doc.get('timestamp'))
+                    if timestamp is None or (since and timestamp < since) or (until and timestamp > until):
+                        continue
+                page.append(dict(doc))
+            next_cursor = self.documents[index - 1]['seq'] if index < len(self.documents) else None
+        return page, next_cursor
+    
+    def reindex(self):
+        """Re-encode every stored job description with the current model"""
+        self._assign_sequence()
+        if not self.documents:
+            self.embeddings = []
+            return
+        job_descriptions = [doc['job_description'] for doc in self.documents]
+        self.embeddings = list(self.model.encode(job_descriptions))
+    
+    def delete_document(self, job_description, interview_level):
+        """Delete a document from the vector store"""
+        try:
+            doc_id = self._generate_doc_id(job_description, interview_level)
+            with self._lock:
+                for i, doc in enumerate(self.documents):
+                    if doc.get('doc_id') == doc_id:
+                        del self.documents[i]
+                        del self.embeddings[i]
+                        self.save_data()
+                        return True
+            return False
+        except Exception as e:
+            print(f"Error deleting document: {e}")
+            return False
+    
+    def find_similar(self, job_description, interview_level, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """Return (document, similarity) for the best match above the threshold, or None"""
         try:
             if not self.documents or not self.embeddings:
                 return None
@@ -102,10 +181,11 @@ class SimpleVectorStore:
             level_filtered_docs = []
             level_filtered_embeddings = []
             
-            for i, doc in enumerate(self.documents):
-                if doc.get('interview_level') == interview_level:
-                    level_filtered_docs.append(doc)
-                    level_filtered_embeddings.append(self.embeddings[i])
+            with self._lock:
+                for i, doc in enumerate(self.documents):
+                    if doc.get('interview_level') == interview_level:
+                        level_filtered_docs.append(doc)
+                        level_filtered_embeddings.append(self.embeddings[i])
             
             if not level_filtered_docs:
                 return None
@@ -113,7 +193,8 @@ class SimpleVectorStore:
             # Generate embedding for query
             query_embedding = self.model.encode([job_description])
             
-            # Calculate similarities
+            # Calculate similarities (sklearn is slow to import, so load it on first search)
+            from sklearn.metrics.pairwise import cosine_similarity
             similarities = cosine_similarity(query_embedding, level_filtered_embeddings)[0]
             
             # Find best match
@@ -121,7 +202,7 @@ class SimpleVectorStore:
             max_similarity = similarities[max_similarity_idx]
             
             if max_similarity >= similarity_threshold:
-                return level_filtered_docs[max_similarity_idx]['qa_content']
+                return level_filtered_docs[max_similarity_idx], float(max_similarity)
             
             return None
         except Exception as e:
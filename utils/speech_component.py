@@ -0,0 +1,36 @@
+import os
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend", "speech")
+
+_speech_component = components.declare_component("speech_control", path=_FRONTEND_DIR)
+
+def speech_control(action=None, segments=None, request_id=None, key="speech_control"):
+    """
+    Render the browser speech widget and return its latest event
+    
+    The widget runs the Web Speech API in the browser and reports back when
+    it finishes, so the script never waits on audio. Each new request_id
+    starts one action; re-rendering the same request_id does nothing, so the
+    segments only need to be sent on the first render of a request.
+    
+    While speaking, the widget shows its own pause/skip/stop controls that
+    work without a rerun.
+    
+    Args:
+        action (str): "listen", "speak", "stop" or None
+        segments (list): Segments from utils.speech_text.split_segments for "speak"
+        request_id (str): New unique id to start a new action
+        key (str): Streamlit widget key
+    
+    Returns:
+        dict: Latest event, e.g. {"type": "voice_complete", "request_id": 3,
+        "transcript": "..."}, or None before any event
+    """
+    return _speech_component(
+        action=action,
+        segments=segments,
+        request_id=request_id,
+        key=key,
+        default=None
+    )
@@ -0,0 +1,83 @@
+import re
+
+# Chrome stops long utterances after ~15 s, so keep each one short
+MAX_SEGMENT_CHARS = 220
+
+_QUESTION_LINE = re.compile(r"^(?:\*\*|__)?\s*(?:Q|Question\s*)\d+\s*[:.)]", re.IGNORECASE)
+_HEADING_LINE = re.compile(r"^#{1,6}\s+")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:])\s+")
+
+
+def strip_markdown(text):
+    """Remove markdown syntax that would otherwise be read aloud"""
+    text = re.sub(r"```\w*", " ", text)
+    text = re.sub(r"!?\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"^\s*#{1,6}\s*", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^\s*(?:[-*+]|\d+\.)\s+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"[*_`>|]+", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _split_long(sentence, max_chars):
+    """Split a sentence over max_chars at clause breaks, then at spaces"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces = []
+    current = ""
+    for part in _CLAUSE_BREAK.split(sentence):
+        for word in part.split(" ") if len(part) > max_chars else [part]:
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(text, max_chars=MAX_SEGMENT_CHARS):
+    """Split plain text into sentences of at most max_chars characters"""
+    sentences = []
+    for sentence in _SENTENCE_BREAK.split(text.strip()):
+        if sentence.strip():
+            sentences.extend(_split_long(sentence.strip(), max_chars))
+    return sentences
+
+
+def split_segments(markdown, max_chars=MAX_SEGMENT_CHARS):
+    """
+    Split Q&A markdown into short, speakable segments grouped by question
+
+    A new group starts at each heading or "Q<n>:"/"Question <n>:" line; a heading and the
+    question that follows it share a group so skipping lands on the heading.
+
+    Returns:
+        list: dicts with "text" (plain sentence), "group" (index of the
+        question block) and "label" (first line of the group)
+    """
+    groups = []
+    current = None
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        is_heading = bool(_HEADING_LINE.match(stripped))
+        is_question = bool(_QUESTION_LINE.match(stripped))
+        if current is None or is_heading or (is_question and current["has_body"]):
+            current = {"label": strip_markdown(stripped)[:60], "lines": [], "has_body": False}
+            groups.append(current)
+        current["lines"].append(stripped)
+        if not is_heading:
+            current["has_body"] = True
+
+    segments = []
+    for index, group in enumerate(groups):
+        # Each line ends a sentence, so a heading is not run into its question
+        lines = [strip_markdown(line) for line in group["lines"]]
+        text = " ".join(line if line[-1:] in ".!?:" else line + "." for line in lines if line)
+        for sentence in split_sentences(text, max_chars):
+            segments.append({"text": sentence, "group": index, "label": group["label"]})
+    return segments
@@ -0,0 +1,111 @@
+import hashlib
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_BACKEND = "simple"
+BACKENDS = ("simple", "chroma")
+
+
+class BaseVectorStore(ABC):
+    """Common interface for the Q&A vector store backends.
+
+    Every backend reports similarity as cosine similarity (1.0 for identical
+    job descriptions, lower is less similar), so ``similarity_threshold`` means
+    the same thing whichever backend is configured. Documents are returned as
+    dicts with doc_id, job_description, qa_content, interview_level and
+    timestamp keys. Backends must implement every abstract method; an
+    incomplete backend fails when it is created.
+    """
+
+    def _generate_doc_id(self, job_description, interview_level):
+        """Generate a unique document ID based on job description and level"""
+        content = f"{job_description.strip().lower()}_{interview_level}"
+        return hashlib.md5(content.encode()).hexdigest()
+
+    @abstractmethod
+    def add_document(self, job_description, qa_content, interview_level, doc_id=None):
+        """Add or replace a document; returns True on success
+
+        doc_id defaults to _generate_doc_id(job_description, interview_level);
+        pass a stored document's doc_id to replace exactly that document.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_similar(self, job_description, interview_level, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """Return (document, similarity) for the best match above the threshold, or None"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_document(self, job_description, interview_level):
+        """Delete a document; returns True on success"""
+        raise NotImplementedError
+
+    def search_similar(self, job_description, interview_level, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """Return the Q&A content of the best match above the threshold, or None"""
+        match = self.find_similar(job_description, interview_level, similarity_threshold)
+        if match:
+            return match[0]['qa_content']
+        return None
+
+    @abstractmethod
+    def list_documents(self, cursor=None, page_size=DEFAULT_PAGE_SIZE, interview_level=None, since=None, until=None):
+        """Return one page of stored documents without computing embeddings.
+
+        Args:
+            cursor: Opaque cursor from the previous page (None for the first page)
+            page_size (int): Maximum number of documents in the page
+            interview_level (str): Only return documents for this level
+            since, until (datetime or ISO string): Inclusive timestamp bounds
+
+        Returns:
+            tuple: (documents, next_cursor); next_cursor is None after the last page
+        """
+        raise NotImplementedError
+
+    def iter_documents(self, page_size=DEFAULT_PAGE_SIZE, interview_level=None, since=None, until=None):
+        """Iterate over all matching documents, fetching page_size at a time"""
+        cursor = None
+        while True:
+            documents, cursor = self.list_documents(cursor, page_size, interview_level, since, until)
+            yield from documents
+            if cursor is None:
+                return
+
+    def get_all_documents(self):
+        """Get all documents from the vector store"""
+        return list(self.iter_documents())
+
+
+def to_datetime(value):
+    """Accept a datetime or ISO 8601 string (as stored in document timestamps)
+
+    Stored timestamps are naive local time, so timezone-aware values (e.g.
+    "...Z") are converted to naive local time to stay comparable.
+    """
+    if value is None:
+        return value
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def create_vector_store(backend=None, **kwargs):
+    """Create a vector store for the named backend ("simple" or "chroma").
+
+    Backends are imported on demand so the Chroma/OpenAI dependencies are only
+    needed when that backend is selected. Keyword arguments are passed to the
+    backend constructor.
+    """
+    backend = (backend or DEFAULT_BACKEND).lower()
+    if backend == "simple":
+        from .simple_vector_store import SimpleVectorStore
+        return SimpleVectorStore(**kwargs)
+    if backend == "chroma":
+        from .vector_store import VectorStore
+        return VectorStore(**kwargs)
+    raise ValueError(f"Unknown vector store backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
@@ -1,9 +1,10 @@
 import os
-import hashlib
+from datetime import datetime
 import streamlit as st
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain.schema import Document
+from .store_base import BaseVectorStore, DEFAULT_SIMILARITY_THRESHOLD, DEFAULT_PAGE_SIZE, to_datetime
 
 # Use a temp directory for Streamlit Cloud
 CHROMA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "chroma_db")
@@ -17,33 +18,61 @@ def get_openai_api_key():
         load_dotenv()
         return os.getenv("OPENAI_API_KEY")
 
-def get_vectorstore():
+def get_vectorstore(persist_directory=None, embedding_function=None):
     """Initialize and return the vector store"""
-    os.makedirs(CHROMA_DIR, exist_ok=True)
-    api_key = get_openai_api_key()
-    embeddings = OpenAIEmbeddings(openai_api_key=api_key)
-    return Chroma(persist_directory=CHROMA_DIR, embedding_function=embeddings)
+    persist_directory = persist_directory or CHROMA_DIR
+    os.makedirs(persist_directory, exist_ok=True)
+    if embedding_function is None:
+        api_key = get_openai_api_key()
+        embedding_function = OpenAIEmbeddings(openai_api_key=api_key)
+    return Chroma(persist_directory=persist_directory, embedding_function=embedding_function)
 
-class VectorStore:
-    def __init__(self):
-        self.vectorstore = get_vectorstore()
+class VectorStore(BaseVectorStore):
+    def __init__(self, persist_directory=None, embedding_function=None):
+        """
+        Args:
+            persist_directory (str): Chroma directory (defaults to CHROMA_DIR)
+            embedding_function: LangChain embeddings (defaults to OpenAIEmbeddings)
+        """
+        self.vectorstore = get_vectorstore(persist_directory, embedding_function)
+        collection_metadata = self.vectorstore._collection.metadata or {}
+        self.distance_space = collection_metadata.get("hnsw:space", "l2")
     
-    def _generate_doc_id(self, job_description, interview_level):
-        """Generate a unique document ID based on job description and level"""
-        content = f"{job_description.strip().lower()}_{interview_level}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def _distance_to_similarity(self, distance):
+        """Convert a Chroma distance into cosine similarity.
+
+        Embeddings are unit-length (OpenAI, and the offline stand-in), so the
+        default squared-L2 distance is 2 - 2 * cosine.
+        """
+        if self.distance_space in ("cosine", "ip"):
+            return 1.0 - distance
+        return 1.0 - distance / 2.0
+    
+    def _to_document(self, page_content, metadata):
+        return {
+            'doc_id': metadata.get('doc_id'),
+            'job_description': metadata.get('job_description', ''),
+            'qa_content': page_content,
+            'interview_level': metadata.get('interview_level'),
+            'timestamp': metadata.get('timestamp')
+        }
     
-    def add_document(self, job_description, qa_content, interview_level):
-        """Add a document to the vector store"""
+    def add_document(self, job_description, qa_content, interview_level, doc_id=None):
+        """Add a document to the vector store (replacing doc_id if given)"""
         try:
-            # Generate unique document ID
-            doc_id = self._generate_doc_id(job_description, interview_level)
+            # Generate unique document ID unless replacing a stored one
+            doc_id = doc_id or self._generate_doc_id(job_description, interview_level)
+            now = datetime.now()
             
             # Create metadata
             metadata = {
                 "interview_level": interview_level,
-                "job_description": job_description[:500],  # Truncate for metadata
-                "doc_id": doc_id
+                # Kept in full so a refresh regenerates (and upserts) the same doc_id
+                "job_description": job_description,
+                "doc_id": doc_id,
+                "timestamp": now.isoformat(),
+                # Numeric copy so list_documents can filter by time in Chroma
+                "timestamp_epoch": now.timestamp()
             }
             
             # Create document
@@ -60,24 +89,21 @@ class VectorStore:
             print(f"Error adding document to vector store: {e}")
             return False
     
-    def search_similar(self, job_description, interview_level, k=1, similarity_threshold=0.8):
-        """Search for similar documents in the vector store"""
+    def find_similar(self, job_description, interview_level, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        """Return (document, similarity) for the best match above the threshold, or None"""
         try:
-            # First try to find exact match using document ID
-            doc_id = self._generate_doc_id(job_description, interview_level)
-            
             # Perform similarity search with filter
             results = self.vectorstore.similarity_search_with_score(
                 job_description, 
-                k=k,
+                k=1,
                 filter={"interview_level": interview_level}
             )
             
             if results and len(results) > 0:
-                doc, score = results[0]
-                # Check if it's a good match (lower scores mean higher similarity)
-                if score < (1 - similarity_threshold):
-                    return doc.page_content
+                doc, distance = results[0]
+                similarity = self._distance_to_similarity(distance)
+                if similarity >= similarity_threshold:
+                    return self._to_document(doc.page_content, doc.metadata), similarity
             
             return None
         except Exception as e:
@@ -94,12 +120,55 @@ class VectorStore:
             print(f"Error deleting document from vector store: {e}")
             return False
     
-    def get_all_documents(self):
-        """Get all documents from the vector store"""
-        try:
-            # This is a simple implementation - in practice you might want pagination
-            results = self.vectorstore.similarity_search("", k=100)  # Get up to 100 docs
-            return results
-        except Exception as e:
-            print(f"Error getting all documents from vector store: {e}")
-            return []
+    def list_documents(self, cursor=None, page_size=DEFAULT_PAGE_SIZE, interview_level=None, since=None, until=None):
+        """Return (documents, next_cursor) for one page.
+
+        Chroma's get() has no ordering, so documents are ordered by
+        (timestamp_epoch, doc_id) and the cursor is that key for the last
+        document returned; deletes or inserts between pages never shift the
+        walk. Each page reads the ids and metadata of the remaining matches,
+        then fetches Q&A text only for the page; no embedding is computed.
+        Documents added before timestamp_epoch was stored sort first and are
+        skipped by time filters. Errors propagate so a failed page is never
+        mistaken for the end of the listing.
+        """
+        after = tuple(cursor) if cursor else None
+        conditions = []
+        if interview_level:
+            conditions.append({"interview_level": interview_level})
+        if since is not None:
+            conditions.append({"timestamp_epoch": {"$gte": to_datetime(since).timestamp()}})
+        if until is not None:
+            conditions.append({"timestamp_epoch": {"$lte": to_datetime(until).timestamp()}})
+        if after and after[0] >= 0:
+            conditions.append({"timestamp_epoch": {"$gte": after[0]}})
+        
+        where = None
+        if len(conditions) == 1:
+            where = conditions[0]
+        elif conditions:
+            where = {"$and": conditions}
+        
+        candidates = self.vectorstore.get(where=where, include=["metadatas"])
+        keys = sorted(
+            ((metadata or {}).get("timestamp_epoch", -1.0), doc_id)
+            for doc_id, metadata in zip(candidates["ids"], candidates["metadatas"])
+        )
+        if after:
+            keys = [key for key in keys if key > after]
+        page_keys = keys[:page_size]
+        if not page_keys:
+            return [], None
+        
+        results = self.vectorstore.get(
+            ids=[doc_id for _, doc_id in page_keys],
+            include=["documents", "metadatas"]
+        )
+        by_id = {
+            doc_id: (content, metadata or {})
+            for doc_id, content, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+        }
+        # A document deleted between the two reads is simply left out of the page
+        page = [self._to_document(*by_id[doc_id]) for _, doc_id in page_keys if doc_id in by_id]
+        next_cursor = page_keys[-1] if len(keys) > page_size else None
+        return page, next_cursor
@@ -0,0 +1,85 @@
+import importlib
+import threading
+import time
+
+# Imported in this order; the vector store (embedding model + data) is loaded last
+HEAVY_MODULES = [
+    "numpy",
+    "sklearn.metrics.pairwise",
+    "sentence_transformers",
+    "langchain.prompts",
+    "langchain_google_genai",
+]
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+class WarmUp:
+    """Imports heavy dependencies and loads the vector store on a background thread
+
+    Lets the UI render immediately while the model loads in parallel. The
+    first generation simply waits for whatever is still loading (imports and
+    get_vector_store() are both thread-safe). report() gives the time spent
+    on each step.
+    """
+
+    def __init__(self, modules=None, load_store=True):
+        self.modules = modules or HEAVY_MODULES
+        self.load_store = load_store
+        self.timings = {}
+        self.errors = {}
+        self.done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _time(self, name, func, *args):
+        start = time.perf_counter()
+        try:
+            func(*args)
+        except Exception as e:
+            self.errors[name] = f"{type(e).__name__}: {e}"
+        self.timings[name] = (time.perf_counter() - start) * 1000
+
+    def _run(self):
+        for module in self.modules:
+            self._time(f"import {module}", importlib.import_module, module)
+        if self.load_store:
+            from .qa_generator import get_vector_store
+            self._time("load vector store", get_vector_store)
+        self.done.set()
+        print(self.format_report())
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def report(self):
+        """Step name -> {"ms": elapsed, "error": message or None}"""
+        return {
+            name: {"ms": elapsed, "error": self.errors.get(name)}
+            for name, elapsed in self.timings.items()
+        }
+
+    def format_report(self):
+        lines = ["Warm-up timings:"]
+        for name, row in self.report().items():
+            status = f"  ({row['error']})" if row["error"] else ""
+            lines.append(f"  {row['ms']:9.1f} ms  {name}{status}")
+        lines.append(f"  {sum(self.timings.values()):9.1f} ms  total")
+        return "\n".join(lines)
+
+
+def start_warmup(modules=None, load_store=True):
+    """Start the process-wide warm-up once and return it"""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = WarmUp(modules, load_store).start()
+        return _warmup
+
+
+if __name__ == "__main__":
+    start_warmup().wait()